@@ -1,8 +1,19 @@
 import bibtexparser
-import re
 from collections import defaultdict
 import csv
 import os
+import argparse
+from functools import partial
+from parallel import ordered_map
+from incremental import ScreeningState, classifier_signature, fingerprint, record_key
+from inverted_index import InvertedIndex
+from instrumentation import DISABLED, PROFILERS, RunReport, report_path
+from columnar import ColumnarWriter
+from records import AclPaperRecord, as_record, csv_row
+from acl_screening import categorize_chunk, categorize_paper, compile_patterns, extract_paper_info, screen_entry
+
+# Superset of the title gate in compile_patterns, answered from the index
+CANDIDATE_QUERY = 'title:emot* OR title:empath*'
 
 def load_bibtex_file(file_path):
     """Load and parse a BibTeX file."""
@@ -10,85 +21,84 @@ def load_bibtex_file(file_path):
         parser = bibtexparser.bparser.BibTexParser(common_strings=True)
         return bibtexparser.load(bibtex_file, parser)
 
-def compile_patterns():
-    """Compile regex patterns for paper categorization."""
-    return {
-        'emotion': re.compile(r'\bemotion(?:s|al)?\b', re.IGNORECASE),
-        'empathy': re.compile(r'\bempath(?:y|ic|i[zs]e)\b', re.IGNORECASE),
-        'dataset': re.compile(
-            r'\b(?:dataset|corpus|collection|benchmark|annotated?|labeled)\b',
-            re.IGNORECASE
-        ),
-        'machine_learning': re.compile(
-            r'\b(?:machine\s+learning|deep\s+learning|neural|classifier|classification|'
-            r'supervised|unsupervised|transformer|bert|gpt|llm|embedding|fine-tun|'
-            r'train(?:ing|ed)|model(?:s|ing|ed)?)\b',
-            re.IGNORECASE
-        ),
-        'ai': re.compile(
-            r'\b(?:artificial\s+intelligence|natural\s+language\s+processing|nlp|'
-            r'computational\s+linguistics|language\s+model(?:s|ing)?)\b',
-            re.IGNORECASE
-        )
-    }
-
-def categorize_paper(entry, patterns):
+def _iter_record_chunks(bibtex_file, batch_size):
+    """Yield raw BibTeX text holding at most `batch_size` records each."""
+    lines = []
+    records = 0
+    depth = 0
+    for line in bibtex_file:
+        # A record starts with '@' at column 0 outside any braced value
+        if depth <= 0 and line.startswith('@'):
+            depth = 0
+            if records == batch_size:
+                yield ''.join(lines)
+                lines = []
+                records = 0
+            records += 1
+        depth += line.count('{') - line.count('}')
+        lines.append(line)
+    if lines:
+        yield ''.join(lines)
+
+def iter_bibtex_entries(file_path, batch_size=1000):
     """
-    Categorize a paper based on its abstract and title.
-    Returns a dictionary with classification results and main category.
+    Stream entries from a BibTeX file, parsing `batch_size` records at a time.
+    One parser is reused so @string definitions and the common month strings
+    carry over between batches, matching load_bibtex_file.
     """
-    title = entry.get('title', '').lower()
-    abstract = entry.get('abstract', '').lower()
-    combined_text = f"{title} {abstract}"
-    
-    # Check for emotion and empathy in title
-    emotion_match_title = patterns['emotion'].search(title)
-    empathy_match_title = patterns['empathy'].search(title)
-    
-    # Determine main category based on title matches
-    if emotion_match_title and empathy_match_title:
-        main_category = 'emotion_and_empathy'
-    elif empathy_match_title:
-        main_category = 'empathy'
-    elif emotion_match_title:
-        main_category = 'emotion'
-    else:
-        return None  # Skip papers not related to emotion or empathy
-    
-    # Check for other categories in combined text
-    categories = {
-        'main_category': main_category,
-        'is_dataset': bool(patterns['dataset'].search(combined_text)),
-        'is_ml': bool(patterns['machine_learning'].search(combined_text)),
-        'is_ai': bool(patterns['ai'].search(combined_text))
-    }
-    
-    return categories
-
-def extract_paper_info(entry, categories):
-    """Extract relevant information from a paper entry."""
-    # Clean up author string if it exists
-    authors = entry.get('author', '')
-    if authors:
-        # Remove extra whitespace and newlines
-        authors = ' and '.join(author.strip() for author in authors.split(' and '))
-    
-    return {
-        'title': entry.get('title', '').strip(),
-        'authors': authors,
-        'year': entry.get('year', ''),
-        'booktitle': entry.get('booktitle', ''),
-        'doi': entry.get('doi', ''),
-        'abstract': entry.get('abstract', ''),
-        'url': entry.get('url', ''),
-        'category': categories['main_category'],
-        'is_dataset': categories['is_dataset'],
-        'is_ml': categories['is_ml'],
-        'is_ai': categories['is_ai']
-    }
-
-def analyze_papers(bib_database, patterns):
-    """Analyze all papers in the database."""
+    parser = bibtexparser.bparser.BibTexParser(common_strings=True)
+    parser.expect_multiple_parse = True
+    with open(file_path, 'r', encoding='utf-8') as bibtex_file:
+        for chunk in _iter_record_chunks(bibtex_file, batch_size):
+            parser.parse(chunk)
+            entries = parser.bib_database.entries
+            parser.bib_database.entries = []  # Release parsed entries
+            yield from entries
+
+def count_paper(stats, paper_info, step=1):
+    """Add (or with step=-1 remove) a paper's contribution to the statistics."""
+    category = paper_info['category']
+    stats[category]['papers'] += step
+    if paper_info['is_dataset']:
+        stats[category]['dataset'] += step
+    if paper_info['is_ml']:
+        stats[category]['machine_learning'] += step
+    if paper_info['is_ai']:
+        stats[category]['ai'] += step
+
+def count_entries(entries, report):
+    """Pass entries through, counting them and those without an abstract."""
+    missing_abstract = 0
+    count = 0
+    for count, entry in enumerate(entries, start=1):
+        if 'abstract' not in entry:
+            missing_abstract += 1
+        yield entry
+    report.count('entries', count)
+    report.count('skipped_no_abstract', missing_abstract)
+
+def analyze_papers(entries, matcher, workers=1, chunk_size=1000, state=None, report=DISABLED, sink=None):
+    """
+    Analyze papers from any iterable of entries, e.g. bib_database.entries
+    or the iter_bibtex_entries stream. With workers > 1 chunks are categorized
+    in a process pool and merged back in input order. With a ScreeningState
+    only new or changed entries are categorized and the stored statistics
+    are adjusted instead of recounted. An enabled RunReport times the run
+    and counts the entries seen, skipped and categorized. Relevant papers are
+    also handed to `sink.write` (e.g. a ColumnarWriter) as they are found.
+    """
+    if report.enabled:
+        entries = count_entries(entries, report)
+    with report.stage('screen', profile=True):
+        papers_info, stats = _analyze_papers(entries, matcher, workers, chunk_size, state, sink)
+    report.count('categorized', state.classified if state else
+                 report.counters['entries'] - report.counters['skipped_no_abstract'])
+    report.count('relevant', len(papers_info))
+    for category, counts in stats.items():
+        report.count(category, counts['papers'])
+    return papers_info, stats
+
+def _analyze_papers(entries, matcher, workers, chunk_size, state, sink):
     papers_info = []
     stats = defaultdict(lambda: {
         'papers': 0,
@@ -97,26 +107,47 @@ def analyze_papers(bib_database, patterns):
         'ai': 0
     })
     
-    for entry in bib_database.entries:
-        if 'abstract' not in entry:  # Skip entries without abstracts
-            continue
-            
-        categories = categorize_paper(entry, patterns)
-        if categories:  # Only process papers related to emotion/empathy
-            paper_info = extract_paper_info(entry, categories)
+    if state is None:
+        shard_results = ordered_map(partial(categorize_chunk, matcher=matcher), entries,
+                                    workers=workers, chunk_size=chunk_size)
+        for shard in shard_results:
+            for paper_info in shard:
+                papers_info.append(paper_info)
+                count_paper(stats, paper_info)
+                if sink:
+                    sink.write(paper_info)
+        return papers_info, dict(stats)
+
+    stored_stats = state.get_counters('stats')
+    if stored_stats is None:
+        state.reset()
+    else:
+        stats.update(stored_stats)
+
+    classifier = classifier_signature(matcher, screen_entry, categorize_paper, extract_paper_info)
+    records = ((record_key(entry), fingerprint(classifier, entry), entry) for entry in entries)
+    for paper_info in state.screen(records, partial(screen_entry, matcher=matcher)):
+        if paper_info:
+            paper_info = as_record(AclPaperRecord, paper_info)
             papers_info.append(paper_info)
-            
-            # Update statistics
-            category = categories['main_category']
-            stats[category]['papers'] += 1
-            if categories['is_dataset']:
-                stats[category]['dataset'] += 1
-            if categories['is_ml']:
-                stats[category]['machine_learning'] += 1
-            if categories['is_ai']:
-                stats[category]['ai'] += 1
-    
-    return papers_info, dict(stats)
+            if sink:
+                sink.write(paper_info)
+    for paper_info in state.dropped:
+        count_paper(stats, paper_info, step=-1)
+    for paper_info in state.added:
+        count_paper(stats, paper_info)
+
+    stats = {category: counts for category, counts in stats.items() if counts['papers']}
+    state.set_counters('stats', stats)
+    return papers_info, stats
+
+# Column types of the optional Parquet/Feather output; authors become a list
+COLUMNAR_COLUMNS = [
+    ('title', 'string'), ('authors', 'list'), ('year', 'string'), ('booktitle', 'string'),
+    ('doi', 'string'), ('abstract', 'string'), ('url', 'string'), ('category', 'string'),
+    ('is_dataset', 'bool'), ('is_ml', 'bool'), ('is_ai', 'bool')
+]
+COLUMNAR_LIST_SEPARATORS = {'authors': r'\s+and\s+'}
 
 def save_results_to_csv(papers_info, output_file):
     """Save paper information to a CSV file."""
@@ -126,14 +157,10 @@ def save_results_to_csv(papers_info, output_file):
     ]
     
     with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
         for paper in papers_info:
-            # Convert boolean values to Yes/No
-            paper_copy = paper.copy()
-            for key in ['is_dataset', 'is_ml', 'is_ai']:
-                paper_copy[key] = 'Yes' if paper_copy[key] else 'No'
-            writer.writerow(paper_copy)
+            writer.writerow(csv_row(paper, fieldnames))  # Boolean values become Yes/No
 
 def print_statistics(stats, output_file):
     """Print and save analysis statistics."""
@@ -152,22 +179,67 @@ def print_statistics(stats, output_file):
                 write_line(f"AI/NLP papers: {stats[category]['ai']}")
 
 def main():
+    parser = argparse.ArgumentParser(description='Screen the ACL anthology for emotion/empathy papers.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of classification processes')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Entries per worker task')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only categorize entries that are new or changed since the last run')
+    parser.add_argument('--state', default='screening_state_acl.sqlite', help='Incremental screening state file')
+    parser.add_argument('--index', help='Inverted index file; only entries it matches to '
+                                        'CANDIDATE_QUERY are categorized')
+    parser.add_argument('--report', action='store_true',
+                        help='Write stage timings and counters to a JSON report next to the statistics file')
+    parser.add_argument('--profile', choices=PROFILERS, help='Profile the hot loops (implies --report)')
+    parser.add_argument('--columnar', metavar='PATH',
+                        help='Also write the screened papers to a .parquet or .feather file')
+    args = parser.parse_args()
+
     # File paths
     input_file = '/Volumes/ssd/01-ckj-postdoc/emopathy-dataset-review/boolean-search/all-zot-items/anthology+abstracts.bib'  # Your input BibTeX file
     output_csv = 'final_automatically_screened_acl_papers.csv'
     stats_file = 'final_analysis_statistics_acl.txt'
     
-    # Load and analyze papers
-    bib_database = load_bibtex_file(input_file)
-    patterns = compile_patterns()
-    papers_info, stats = analyze_papers(bib_database, patterns)
+    # Stream and analyze papers
+    matcher = compile_patterns()
+    report = RunReport('acl-filtering', profiler=args.profile) if args.report or args.profile else DISABLED
+    report.set(workers=args.workers, chunk_size=args.chunk_size, incremental=args.incremental,
+               index=bool(args.index))
+    entries = iter_bibtex_entries(input_file)
+    if args.index:
+        with report.stage('index', profile=True), InvertedIndex(args.index) as index:
+            index.update(((record_key(entry), entry) for entry in entries), prune=True)
+            print(f"Indexed {index.indexed} new or changed entries, removed {index.removed}")
+            entries = index.entries(index.search(CANDIDATE_QUERY))
+        report.count('indexed', index.indexed)
+        report.count('index_candidates', len(entries))
+    state = ScreeningState(args.state) if args.incremental else None
+    sink = ColumnarWriter(args.columnar, COLUMNAR_COLUMNS, COLUMNAR_LIST_SEPARATORS) if args.columnar else None
+    try:
+        papers_info, stats = analyze_papers(entries, matcher, workers=args.workers, chunk_size=args.chunk_size,
+                                            state=state, report=report, sink=sink)
+        if state:
+            print(f"Categorized {state.classified} new or changed entries")
+    except BaseException:
+        if sink:
+            sink.abort()
+        raise
+    else:
+        if sink:
+            sink.close()
+            print(f"Columnar paper information saved to {args.columnar}")
+    finally:
+        if state:
+            state.close()
     
     # Save results
-    save_results_to_csv(papers_info, output_csv)
+    with report.stage('write_csv'):
+        save_results_to_csv(papers_info, output_csv)
     print_statistics(stats, stats_file)
     
     print(f"\nResults saved to {output_csv}")
     print(f"Statistics saved to {stats_file}")
+    if report.write(report_path(stats_file)):
+        print(f"Run report saved to {report_path(stats_file)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,144 +1,148 @@
 import os
-import time
 import pandas as pd
-import fitz  # PyMuPDF
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-import re
+from pdf_downloader import PDFDownloader
+from pdf_text import extract_texts
+from model_extraction import ModelMetricExtractor
+from instrumentation import DISABLED, RunReport, report_path
+from text_index import DEFAULT_TEXT_INDEX_PATH, TextIndex
 
 # --- 1. Download PDFs ---
-def download_pdfs(spreadsheet_path, download_dir):
+def download_pdfs(spreadsheet_path, download_dir, workers=8):
+    """Download the PDF of every paper in the spreadsheet, skipping ones already on disk."""
     df = pd.read_csv(spreadsheet_path)
-    options = Options()
-    options.add_experimental_option("prefs", {
-        "download.default_directory": download_dir,
-        "plugins.always_open_pdf_externally": True
-    })
-    driver = webdriver.Chrome(options=options, service=Service("chromedriver"))  # Replace with your chromedriver path
+    downloader = PDFDownloader(download_dir, workers=workers)
+    records = downloader.download_all(df['url'].dropna())
     
-    for index, row in df.iterrows():
-        url = row['url']
-        driver.get(url)
-        try:
-            pdf_button = driver.find_element(By.LINK_TEXT, "PDF")
-            pdf_button.click()
-            time.sleep(3)
-        except Exception as e:
-            print(f"Failed to download PDF for {url}: {e}")
-    
-    driver.quit()
+    for record in records:
+        if record['status'] != 'ok':
+            print(f"Failed to download PDF for {record['url']}: {record['error']}")
+    downloaded = sum(record['status'] == 'ok' for record in records)
+    print(f"{downloaded}/{len(records)} PDFs available in {download_dir}")
+    return records
 
 # --- 2. Extract text from PDF ---
-def extract_text_from_pdf(pdf_path):
-    try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text
-    except Exception as e:
-        print(f"Failed to extract text from {pdf_path}: {e}")
-        return ""
+def print_extraction_summary(infos, summary_csv):
+    """Report per-file extraction timing and failures in one place."""
+    summary_df = pd.DataFrame(infos)
+    summary_df.to_csv(summary_csv, index=False)
+    failed = summary_df[summary_df['error'] != '']
+    print(f"Extracted text from {len(summary_df) - len(failed)}/{len(summary_df)} PDFs "
+          f"({int(summary_df['cached'].sum())} from cache) in {summary_df['seconds'].sum():.1f}s")
+    for _, row in summary_df.nlargest(5, 'seconds').iterrows():
+        print(f"  slowest: {row['file']} ({row['seconds']:.2f}s)")
+    for _, row in failed.iterrows():
+        print(f"  failed: {row['file']}: {row['error']}")
+    print(f"Extraction summary saved to {summary_csv}")
 
 # --- 3. Extract models and performance metrics from sections ---
-def extract_performance_and_models(text):
-    # Split text into sections based on headings (e.g., "1. Methods", "2. Results")
-    section_pattern = r"(?i)(?:(?:^|\n)([0-9]+\.\s+[A-Za-z]+.*))"  # Matches headings like "1. Methods"
-    sections = re.split(section_pattern, text)
-    
-    # If no sections found, consider the entire text as one "default" section
-    if len(sections) <= 1:
-        sections = ["Entire Text", text]
+EXTRACTOR = ModelMetricExtractor()  # Compiled once, reused for every document
 
-    # Define regex patterns
-    model_patterns = [
-        r"\bLSTM(s?)\b", r"\bCNN(s?)\b", r"\bTransformer(s?)\b", r"\bBERT(s?)\b",
-        r"\bGRU(s?)\b", r"\bRNN(s?)\b", r"\bXLNet(s?)\b", r"\bRoBERTa(s?)\b",
-        r"\bGPT(-\d?)?\b", r"\bSVM(s?)\b", r"\bRandom Forest(s?)\b", r"\bXGBoost\b",
-        r"\bLightGBM\b", r"\bCatBoost\b", r"\bKNN\b", r"\bNaive Bayes\b",
-        r"\bDecision Tree(s?)\b", r"\bLinear Regression\b", r"\bLogistic Regression\b",
-        r"\bEnsemble(s?)\b"
-    ]
-    combined_model_pattern = r"(?:" + "|".join(model_patterns) + r")"
-    
-    performance_patterns = [
-        r"(accuracy|f1 score|precision|recall|auc|bleu|rouge|mse|rmse)\s*[:=]?\s*(\d+\.?\d*)"
-    ]
-    combined_performance_pattern = r"(?:" + "|".join(performance_patterns) + r")"
+def extract_performance_and_models(text):
+    return group_hits(EXTRACTOR.iter_hits(text))
 
-    # Results
+def group_hits(hits):
+    """Group the extractor's hits by section heading."""
     section_results = {}
-    
-    for i in range(0, len(sections), 2):  # Process pairs of [heading, content]
-        if i + 1 >= len(sections):
-            break
-        section_heading = sections[i].strip() if sections[i].strip() else "No Heading"
-        section_content = sections[i + 1].strip()
-        
-        # Find models in the section
-        found_models = re.findall(combined_model_pattern, section_content, re.IGNORECASE)
-        unique_models = list(set(model.split("s", 1)[0] for model in found_models))  # Normalize
-        
-        # Find performance metrics in the section
-        found_metrics = re.findall(combined_performance_pattern, section_content, re.IGNORECASE)
-        metrics_dict = {metric.lower().replace(" ", "_"): float(value) for metric, value in found_metrics}
-        
-        section_results[section_heading] = {
-            "models": unique_models,
-            "metrics": metrics_dict
-        }
+    for hit in hits:
+        section = section_results.setdefault(hit['section'], {"models": [], "metrics": {}})
+        if 'model' in hit:
+            if hit['model'] not in section["models"]:
+                section["models"].append(hit['model'])
+        else:
+            section["metrics"][hit['metric']] = hit['value']
     
     return section_results
 
-# --- 4. Main Workflow ---
-def main(spreadsheet_path, download_dir, output_csv, sort_by="f1_score"):
-    print("Starting PDF download...")
-    download_pdfs(spreadsheet_path, download_dir)
-    print("PDF download completed.")
+def summarize_document(record, text):
+    return summarize_hits(record, EXTRACTOR.iter_hits(text))
+
+def summarize_hits(record, hits):
+    """One output row per paper: every model and metric found in any section."""
+    results = group_hits(hits)
     
-    data = []
-    for pdf_file in os.listdir(download_dir):
-        if pdf_file.endswith(".pdf"):
-            pdf_path = os.path.join(download_dir, pdf_file)
-            print(f"Processing {pdf_file}...")
-            
-            text = extract_text_from_pdf(pdf_path)
-            
-            results = extract_performance_and_models(text)
-            
-            # Flatten the results for the entire document
-            all_models = []
-            all_metrics = {}
-            for section, content in results.items():
-                all_models.extend(content["models"])
-                all_metrics.update(content["metrics"])
-            
-            # Remove duplicate models
-            all_models = list(set(all_models))
-            
-            data.append({
-                "file": pdf_file,
-                "models": ", ".join(all_models),
-                "metrics": all_metrics,
-                **all_metrics  # Add metrics as individual columns
-            })
+    # Flatten the results for the entire document
+    all_models = []
+    all_metrics = {}
+    for section, content in results.items():
+        all_models.extend(content["models"])
+        all_metrics.update(content["metrics"])
+    
+    # Remove duplicate models
+    all_models = list(set(all_models))
     
+    return {
+        "file": record['path'],
+        "url": record['url'],
+        "models": ", ".join(all_models),
+        "metrics": all_metrics,
+        **all_metrics  # Add metrics as individual columns
+    }
+
+def summarize_index(index):
+    """The model_performance.csv rows of every paper in a TextIndex, without touching the PDFs."""
+    return [summarize_hits(record, hits) for record, hits in index.iter_papers()]
+
+def save_model_performance(data, output_csv, sort_by="f1_score"):
     result_df = pd.DataFrame(data)
     if sort_by in result_df.columns:
         result_df = result_df.sort_values(by=sort_by, ascending=False)  # Sort by the chosen metric
     result_df.to_csv(output_csv, index=False)
     print(f"Results saved to {output_csv}")
 
+# --- 4. Main Workflow ---
+def main(spreadsheet_path, download_dir, output_csv, sort_by="f1_score", workers=os.cpu_count(),
+         report=DISABLED, index_path=None):
+    print("Starting PDF download...")
+    with report.stage('download'):
+        records = download_pdfs(spreadsheet_path, download_dir)
+    print("PDF download completed.")
+    
+    # Text is cached by PDF hash, and papers already in the text index
+    # reuse their stored hits, so reruns skip the regex pass as well
+    downloaded = [record for record in records if record['status'] == 'ok']
+    pdf_paths = [os.path.join(download_dir, record['path']) for record in downloaded]
+    text_cache_dir = os.path.join(download_dir, 'text-cache')
+    index_path = index_path or os.path.join(download_dir, DEFAULT_TEXT_INDEX_PATH)
+    
+    data = []
+    infos = []
+    with report.stage('extract', profile=True), TextIndex(index_path) as index:
+        for record, (text, info) in zip(downloaded, extract_texts(pdf_paths, text_cache_dir, workers=workers)):
+            infos.append(info)
+            doc_id = index.add(record, None if info['error'] else info['sha256'], text)
+            data.append(summarize_hits(record, index.hits(doc_id)))
+        report.count('indexed_papers', len(index))
+    report.count('papers', len(records))
+    report.count('downloaded', len(downloaded))
+    report.count('download_failed', len(records) - len(downloaded))
+    report.count('text_from_cache', sum(info['cached'] for info in infos))
+    report.count('extraction_failed', sum(bool(info['error']) for info in infos))
+    report.count('with_models', sum(bool(row['models']) for row in data))
+    report.count('with_metrics', sum(bool(row['metrics']) for row in data))
+    
+    if infos:
+        print_extraction_summary(infos, os.path.join(download_dir, 'extraction_summary.csv'))
+    
+    print(f"Text and hits of {len(data)} papers indexed in {index_path}")
+    save_model_performance(data, output_csv, sort_by)
+    if report.write(report_path(output_csv)):
+        print(f"Run report saved to {report_path(output_csv)}")
+
 if __name__ == "__main__":
     SPREADSHEET_PATH = "/Volumes/ssd/01-ckj-postdoc/emopathy-dataset-review/statistics/final_automatically_screened_acl_papers.csv"
     DOWNLOAD_DIR = "/Volumes/ssd/01-ckj-postdoc/emopathy-acl-model-papers" # Your dir for pdf download
     OUTPUT_CSV = "/Volumes/ssd/01-ckj-postdoc/emopathy-dataset-review/statistics/model_performance.csv"
     SORT_BY = "f1_score"                 # Metric to sort by
+    RUN_REPORT = False                   # Write stage timings and counters next to OUTPUT_CSV
+    PROFILER = None                      # "cprofile" or "sample" to profile the extraction loop
+    FROM_INDEX = False                   # Rebuild OUTPUT_CSV from DOWNLOAD_DIR's text index, without the PDFs
 
     if not os.path.exists(DOWNLOAD_DIR):
         os.makedirs(DOWNLOAD_DIR)
 
-    main(SPREADSHEET_PATH, DOWNLOAD_DIR, OUTPUT_CSV, sort_by=SORT_BY)
+    if FROM_INDEX:
+        with TextIndex(os.path.join(DOWNLOAD_DIR, DEFAULT_TEXT_INDEX_PATH)) as index:
+            save_model_performance(summarize_index(index), OUTPUT_CSV, SORT_BY)
+    else:
+        report = RunReport('acl-model-filtering', profiler=PROFILER) if RUN_REPORT or PROFILER else DISABLED
+        main(SPREADSHEET_PATH, DOWNLOAD_DIR, OUTPUT_CSV, sort_by=SORT_BY, report=report)
@@ -0,0 +1,92 @@
+"""
+Screening of single ACL anthology entries, kept in an importable module so
+process pools can pickle the functions by name, whatever the start method.
+"""
+from matcher import CategoryMatcher
+from records import AclPaperRecord
+
+def compile_patterns():
+    """Build the matcher holding the term lists for paper categorization."""
+    return CategoryMatcher({
+        'emotion': [r'emotion(?:s|al)?'],
+        'empathy': [r'empath(?:y|ic|i[zs]e)'],
+        'dataset': [r'dataset', r'corpus', r'collection', r'benchmark', r'annotated?', r'labeled'],
+        'machine_learning': [
+            r'machine\s+learning', r'deep\s+learning', r'neural', r'classifier', r'classification',
+            r'supervised', r'unsupervised', r'transformer', r'bert', r'gpt', r'llm', r'embedding',
+            r'fine-tun', r'train(?:ing|ed)', r'model(?:s|ing|ed)?'
+        ],
+        'ai': [
+            r'artificial\s+intelligence', r'natural\s+language\s+processing', r'nlp',
+            r'computational\s+linguistics', r'language\s+model(?:s|ing)?'
+        ]
+    }, title_categories=('emotion', 'empathy'))
+
+def categorize_paper(entry, matcher):
+    """
+    Categorize a paper based on its abstract and title.
+    Returns a dictionary with classification results and main category.
+    """
+    # Emotion and empathy are matched in the title, the rest in title + abstract
+    found = matcher.match(entry.get('title', ''), entry.get('abstract', ''))
+    
+    # Determine main category based on title matches
+    if 'emotion' in found and 'empathy' in found:
+        main_category = 'emotion_and_empathy'
+    elif 'empathy' in found:
+        main_category = 'empathy'
+    elif 'emotion' in found:
+        main_category = 'emotion'
+    else:
+        return None  # Skip papers not related to emotion or empathy
+    
+    # Check for other categories in combined text
+    categories = {
+        'main_category': main_category,
+        'is_dataset': 'dataset' in found,
+        'is_ml': 'machine_learning' in found,
+        'is_ai': 'ai' in found
+    }
+    
+    return categories
+
+def extract_paper_info(entry, categories):
+    """Extract relevant information from a paper entry."""
+    # Clean up author string if it exists
+    authors = entry.get('author', '')
+    if authors:
+        # Remove extra whitespace and newlines
+        authors = ' and '.join(author.strip() for author in authors.split(' and '))
+    
+    return AclPaperRecord(
+        title=entry.get('title', '').strip(),
+        authors=authors,
+        year=entry.get('year', ''),
+        booktitle=entry.get('booktitle', ''),
+        doi=entry.get('doi', ''),
+        abstract=entry.get('abstract', ''),
+        url=entry.get('url', ''),
+        category=categories['main_category'],
+        is_dataset=categories['is_dataset'],
+        is_ml=categories['is_ml'],
+        is_ai=categories['is_ai']
+    )
+
+def screen_entry(entry, matcher):
+    """Return paper info for a relevant entry, or None."""
+    if 'abstract' not in entry:  # Skip entries without abstracts
+        return None
+        
+    categories = categorize_paper(entry, matcher)
+    if categories:  # Only process papers related to emotion/empathy
+        return extract_paper_info(entry, categories)
+    return None
+
+def categorize_chunk(chunk, matcher):
+    """Categorize a chunk of entries and return info for the relevant papers."""
+    papers_info = []
+    for entry in chunk:
+        paper_info = screen_entry(entry, matcher)
+        if paper_info:
+            papers_info.append(paper_info)
+    return papers_info
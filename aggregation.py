@@ -0,0 +1,169 @@
+"""
+Statistics from the screened-paper output instead of from the raw exports.
+
+    python aggregation.py statistics/final_automatically_screened_papers.csv \
+        --stats final_analysis_statistics.txt --analysis-csv emotion_empathy_papers_analysis.csv
+    python aggregation.py statistics/final_automatically_screened_acl_papers.csv \
+        --stats final_analysis_statistics_acl.txt
+    python aggregation.py statistics/final_automatically_screened_papers.csv --group-by year,category,database
+"""
+import argparse
+import importlib.util
+import os
+import re
+import sys
+
+import pandas as pd
+
+from columnar import FEATHER_EXTENSIONS, load_columns
+from filtering import OVERALL_TOTALS, print_and_save_stats
+
+CATEGORIES = ['emotion', 'empathy', 'emotion_and_empathy']
+# Boolean columns of the screened output and the counter names the scripts use for them
+FLAGS = {'is_dataset': 'dataset', 'is_ml': 'machine_learning', 'is_ai': 'ai'}
+
+def load_screened(path, columns=None):
+    """
+    Load screened papers from the CSV export or the columnar output, with
+    the "Yes"/"No" flags turned back into booleans.
+    """
+    if path.endswith(('.parquet',) + FEATHER_EXTENSIONS):
+        return load_columns(path, columns, as_pandas=True)
+    df = pd.read_csv(path, usecols=columns, keep_default_na=False, dtype=str)
+    for flag in FLAGS:
+        if flag in df.columns:
+            df[flag] = df[flag].eq('Yes')
+    return df
+
+def crosstab(df, by):
+    """
+    Paper counts and flag counts for any grouping of the screened papers,
+    e.g. crosstab(df, ['year', 'category', 'database']). Columns are named
+    like the scripts' counters: papers, dataset, machine_learning, ai.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    flags = [flag for flag in FLAGS if flag in df.columns]
+    grouped = df.groupby(by, sort=False, observed=True)
+    table = grouped[flags].sum().astype(int) if flags else pd.DataFrame(index=grouped.size().index)
+    table.insert(0, 'papers', grouped.size())
+    return table.rename(columns=FLAGS)
+
+def _counts(row, names):
+    return {name: int(row[name]) if row is not None else 0 for name in names}
+
+def category_stats(df, names=('papers', 'dataset', 'machine_learning')):
+    """{category: {counter: n}} for the categories present, like print_statistics expects."""
+    table = crosstab(df, 'category')
+    return {category: _counts(table.loc[category], names) for category in CATEGORIES if category in table.index}
+
+def database_stats(df, names=('papers', 'machine_learning', 'dataset')):
+    """
+    ({database: {category: counts}}, {category: counts}) in the shape
+    analyze_databases returns, with every category present for every
+    database and databases in order of first appearance.
+    """
+    table = crosstab(df, ['database', 'category'])
+    totals = crosstab(df, 'category')
+    per_database = {}
+    for database in df['database'].drop_duplicates():
+        per_database[database] = {
+            category: _counts(table.loc[(database, category)] if (database, category) in table.index else None,
+                              names)
+            for category in CATEGORIES}
+    overall = {category: _counts(totals.loc[category] if category in totals.index else None, names)
+               for category in CATEGORIES}
+    return per_database, overall
+
+def papers_analysis(df):
+    """
+    One row per (database, category, subcategory, lowercased title) as in
+    emotion_empathy_papers_analysis.csv: every paper under "papers", plus
+    "machine_learning" and "dataset" rows for the flagged ones. Titles keep
+    the order of the screened output within each group.
+    """
+    papers = df[['database', 'category', 'title', 'is_ml', 'is_dataset']].copy()
+    papers['title'] = papers['title'].str.lower()
+    parts = []
+    for rank, (subcategory, mask) in enumerate([('papers', None), ('machine_learning', papers['is_ml']),
+                                                ('dataset', papers['is_dataset'])]):
+        part = papers if mask is None else papers[mask]
+        parts.append(part.assign(subcategory=subcategory, rank=rank))
+    rows = pd.concat(parts)
+    rows['database_order'] = rows['database'].map({db: i for i, db in enumerate(df['database'].drop_duplicates())})
+    rows['category_order'] = rows['category'].map({category: i for i, category in enumerate(CATEGORIES)})
+    rows = rows.sort_values(['database_order', 'category_order', 'rank'], kind='stable')
+    return pd.DataFrame({'Database': rows['database'].to_numpy(), 'Category': rows['category'].to_numpy(),
+                         'Subcategory': rows['subcategory'].to_numpy(), 'Paper Title': rows['title'].to_numpy()})
+
+def read_overall_totals(stats_file):
+    """Recover the raw-export totals from the header of an earlier statistics file."""
+    totals = {}
+    with open(stats_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            for key, label in OVERALL_TOTALS.items():
+                match = re.fullmatch(re.escape(label) + r': (\d+)', line.rstrip('\n'))
+                if match:
+                    totals[key] = int(match.group(1))
+    return totals
+
+def load_script(name, filename):
+    """Import a screening script whose file name is not a module name."""
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            name, os.path.join(os.path.dirname(os.path.abspath(__file__)), filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+def write_database_statistics(df, stats_file, totals=None):
+    """Regenerate final_analysis_statistics.txt; `totals` fills in the raw-export header lines."""
+    per_database, overall = database_stats(df)
+    overall.update(totals or {})
+    print_and_save_stats(per_database, overall, stats_file)
+
+def write_acl_statistics(df, stats_file):
+    """Regenerate final_analysis_statistics_acl.txt with acl-filtering's print_statistics."""
+    acl_filtering = load_script('acl_filtering', 'acl-filtering.py')
+    acl_filtering.print_statistics(category_stats(df, ('papers', 'dataset', 'machine_learning', 'ai')), stats_file)
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate screening statistics from the screened papers.')
+    parser.add_argument('screened', help='Screened-paper CSV, Parquet or Feather file')
+    parser.add_argument('--stats', help='Statistics text file to write')
+    parser.add_argument('--totals-from', help='Earlier statistics file to take the raw-export totals from '
+                                              '(default: the --stats file, if it exists)')
+    parser.add_argument('--analysis-csv', help='Write the per-title analysis CSV (database exports only)')
+    parser.add_argument('--group-by', help='Comma-separated columns to cross-tabulate, e.g. year,category')
+    parser.add_argument('--output', help='CSV file for the --group-by table (default: print it)')
+    args = parser.parse_args()
+
+    df = load_screened(args.screened)
+    is_acl = 'database' not in df.columns
+
+    if args.stats:
+        if is_acl:
+            write_acl_statistics(df, args.stats)
+        else:
+            totals_file = args.totals_from or (args.stats if os.path.exists(args.stats) else None)
+            totals = read_overall_totals(totals_file) if totals_file else {}
+            write_database_statistics(df, args.stats, totals)
+        print(f"Statistics saved to {args.stats}")
+
+    if args.analysis_csv:
+        if is_acl:
+            parser.error('--analysis-csv needs the database screening output')
+        papers_analysis(df).to_csv(args.analysis_csv, index=False)
+        print(f"Paper analysis saved to {args.analysis_csv}")
+
+    if args.group_by:
+        table = crosstab(df, args.group_by.split(','))
+        if args.output:
+            table.to_csv(args.output)
+            print(f"Cross-tab saved to {args.output}")
+        else:
+            print(table.to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Timing of the notebook's ACL boolean search vs. acl_boolean_search.py.
+
+The notebook fills the frame with df.loc[index, column] and applies the eldar
+Query row by row; the module builds the frame at once and evaluates the
+query column-wise, or answers it from the inverted index (timed separately
+for the one-off build and for the queries). All must return the same rows.
+Run from the repo root:
+    python benchmarks/bench_boolean_search.py --entries 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from eldar import Query
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'boolean-search', 'ACL'))
+
+from acl_boolean_search import (EMOTION_QUERY, EMPATHY_QUERY, InvertedIndex, entries_to_frame,
+                                index_keys, search)
+
+WORDS = ("the of and to in a we for on with language model task data results approach "
+         "emotion emotions emotional empathy empathetic empathic detection detecting recognition "
+         "recognize prediction predicting classification classifier emotive Émotion naïve "
+         "dialogue speech text, (detection) corpus").split()
+
+def make_entries(count, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'ID': f"paper{i}",
+        'title': ' '.join(rng.choice(WORDS) for _ in range(8)),
+        'author': 'Doe, Jane and Roe, Richard',
+        'booktitle': 'Proceedings of ACL',
+        'year': str(2000 + i % 24),
+        'url': f"https://aclanthology.org/{i}",
+        'abstract': ' '.join(rng.choice(WORDS) for _ in range(120)) if i % 9 else '',
+    } for i in range(count)]
+
+def notebook_search(entries):
+    df = pd.DataFrame(columns=['title', 'author', 'booktitle', 'year', 'url', 'abstract'])
+    for index, bibitem in enumerate(entries):
+        df.loc[index, 'title'] = bibitem.get('title', "")
+        df.loc[index, 'author'] = bibitem.get('author', "")
+        df.loc[index, 'booktitle'] = bibitem.get('booktitle', "")
+        df.loc[index, 'year'] = bibitem.get('year', "")
+        df.loc[index, 'url'] = bibitem.get('url', "")
+        df.loc[index, 'abstract'] = bibitem.get('abstract', "")
+    df['title-abstract'] = df['title'].astype(str) + " " + df['abstract'].astype(str)
+    emp_eldar = Query(EMPATHY_QUERY, ignore_case=True, ignore_accent=True, match_word=True)
+    emo_eldar = Query(EMOTION_QUERY, ignore_case=True, ignore_accent=True, match_word=True)
+    return {EMPATHY_QUERY: df[df['title-abstract'].apply(emp_eldar)],
+            EMOTION_QUERY: df[df['title-abstract'].apply(emo_eldar)]}
+
+def vectorized_search(entries):
+    return search(entries_to_frame(entries), [EMPATHY_QUERY, EMOTION_QUERY])
+
+def indexed_search(entries, index_path):
+    """Build the index (timed apart), then return the rows the queries match."""
+    df = entries_to_frame(entries)
+    start = time.perf_counter()
+    with InvertedIndex(index_path) as index:
+        index.update(((entry['ID'], entry) for entry in entries), prune=True)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        hits = {query: index.search(query) for query in (EMPATHY_QUERY, EMOTION_QUERY)}
+        query_seconds = time.perf_counter() - start
+    keys = pd.Series(index_keys(entries), index=df.index)
+    return {query: df[keys.isin(found)] for query, found in hits.items()}, build_seconds, query_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=5000)
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries)
+    timings = {}
+    results = {}
+    for label, func in (('notebook', notebook_search), ('vectorized', vectorized_search)):
+        start = time.perf_counter()
+        results[label] = func(entries)
+        timings[label] = time.perf_counter() - start
+        counts = ', '.join(f"{len(rows)}" for rows in results[label].values())
+        print(f"{label:10s} {timings[label]:7.2f}s  empathy/emotion hits: {counts}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results['index'], build_seconds, query_seconds = indexed_search(entries, os.path.join(tmp, 'index.sqlite'))
+    print(f"index      {build_seconds:7.2f}s build, {query_seconds * 1000:.1f}ms for both queries")
+
+    for label in ('vectorized', 'index'):
+        for query in (EMPATHY_QUERY, EMOTION_QUERY):
+            assert list(results['notebook'][query].index) == list(results[label][query].index), (label, query)
+    print(f"speedup    {timings['notebook'] / timings['vectorized']:.0f}x (identical result sets)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Throughput of PDFDownloader against a local stand-in for the paper site.
+
+The stand-in serves landing pages with a "PDF" link, PDFs behind a fixed
+latency, and a 503 on every tenth PDF's first request to exercise retries.
+Run from the repository root:
+    python benchmarks/bench_downloader.py --papers 200 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pdf_downloader import PDFDownloader
+
+def make_handler(latency, pdf_size):
+    failed_once = set()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            paper = self.path.strip('/').split('/')[-1]
+            if not paper.endswith('.pdf'):
+                body = f'<html><a class="btn" href="/papers/{paper}.pdf"><span>PDF</span></a></html>'
+                return self._send(200, body.encode(), 'text/html')
+            number = int(paper[:-4])
+            with lock:
+                first = number % 10 == 0 and number not in failed_once
+                failed_once.add(number)
+            if first:
+                return self._send(503, b'busy', 'text/plain')
+            time.sleep(latency)
+            body = b'%PDF-1.4\n' + number.to_bytes(4, 'big') * (pdf_size // 4)
+            self._send(200, body, 'application/pdf')
+
+    return Handler
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping idle keep-alive connections is expected here
+        if not isinstance(sys.exc_info()[1], ConnectionResetError):
+            super().handle_error(request, client_address)
+
+def run(urls, workers):
+    with tempfile.TemporaryDirectory() as download_dir:
+        downloader = PDFDownloader(download_dir, workers=workers, min_interval=0, backoff=0.01)
+        start = time.perf_counter()
+        records = downloader.download_all(urls)
+        elapsed = time.perf_counter() - start
+        assert all(record['status'] == 'ok' for record in records), records
+
+        rerun = PDFDownloader(download_dir, workers=workers)
+        start = time.perf_counter()
+        rerun.download_all(urls)
+        rerun_elapsed = time.perf_counter() - start
+    return elapsed, rerun_elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--papers', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per PDF response')
+    parser.add_argument('--pdf-kb', type=int, default=256)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    args = parser.parse_args()
+
+    server = StandInServer(('127.0.0.1', 0), make_handler(args.latency, args.pdf_kb * 1024))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    for workers in args.workers:
+        # Fresh paper numbers per run so every run sees the injected 503s
+        offset = workers * args.papers
+        urls = [f"{base_url}/papers/{offset + i}" for i in range(args.papers)]
+        elapsed, rerun_elapsed = run(urls, workers)
+        print(f"workers={workers:3d}  {elapsed:6.2f}s  {args.papers / elapsed:7.1f} papers/s  "
+              f"rerun {rerun_elapsed:.3f}s")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
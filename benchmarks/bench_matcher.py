@@ -0,0 +1,92 @@
+"""
+Microbenchmark: per-category regex loop vs. the single-pass CategoryMatcher.
+
+Run from the repository root:
+    python benchmarks/bench_matcher.py --entries 20000
+"""
+import argparse
+import importlib.util
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FILLER = ("the of and to in a is that for we on with as are this by be from our an which "
+          "study approach show paper propose method analysis users social online speech "
+          "questions answers knowledge graph retrieval translation summarization parsing "
+          "syntax semantic discourse dialogue responses evaluation human participants").split()
+SIGNAL = ("emotion emotional empathy empathic dataset corpus annotated labeled neural "
+          "classification model trained transformer bert nlp language modeling").split()
+
+def load_acl_filtering():
+    spec = importlib.util.spec_from_file_location('acl_filtering', os.path.join(ROOT, 'acl-filtering.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_entries(count, seed=0):
+    """Titles hit emotion/empathy about 5% of the time, like the anthology."""
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(count):
+        title = ' '.join(rng.choice(FILLER) for _ in range(8))
+        if rng.random() < 0.05:
+            title += ' ' + rng.choice(SIGNAL[:4])
+        words = [rng.choice(SIGNAL) if rng.random() < 0.02 else rng.choice(FILLER) for _ in range(160)]
+        entries.append({'title': title, 'abstract': ' '.join(words)})
+    return entries
+
+def regex_loop(entries, patterns):
+    """The previous implementation: lowercase title + abstract, one search per category."""
+    hits = 0
+    for entry in entries:
+        title = entry.get('title', '').lower()
+        abstract = entry.get('abstract', '').lower()
+        combined_text = f"{title} {abstract}"
+        if not (patterns['emotion'].search(title) or patterns['empathy'].search(title)):
+            continue
+        for name in ('dataset', 'machine_learning', 'ai'):
+            hits += bool(patterns[name].search(combined_text))
+    return hits
+
+def matcher_loop(entries, matcher):
+    hits = 0
+    for entry in entries:
+        found = matcher.match(entry.get('title', ''), entry.get('abstract', ''))
+        hits += len(found - {'emotion', 'empathy'}) if found else 0
+    return hits
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    acl = load_acl_filtering()
+    matcher = acl.compile_patterns()
+    patterns = {name: re.compile(r'\b(?:' + '|'.join(terms) + r')\b', re.IGNORECASE)
+                for name, terms in matcher.categories.items()}
+    entries = make_entries(args.entries)
+
+    loop_time, loop_hits = best_of(lambda: regex_loop(entries, patterns), args.repeat)
+    matcher_time, matcher_hits = best_of(lambda: matcher_loop(entries, matcher), args.repeat)
+    assert loop_hits == matcher_hits, (loop_hits, matcher_hits)
+
+    for label, elapsed in (('regex loop', loop_time), ('CategoryMatcher', matcher_time)):
+        print(f"{label:16s} {elapsed:.3f}s  {elapsed / args.entries * 1e6:.2f} us/entry")
+    print(f"speedup          {loop_time / matcher_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
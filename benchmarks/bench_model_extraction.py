@@ -0,0 +1,91 @@
+"""
+Throughput of ModelMetricExtractor vs. the previous split-then-findall code.
+
+Pass --text-dir to benchmark on real extracted texts (e.g. the text-cache
+directory written by acl-model-filtering.py); otherwise a deterministic
+synthetic corpus is generated. Run from the repository root:
+    python benchmarks/bench_model_extraction.py --documents 300
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from model_extraction import ModelMetricExtractor
+from synthetic_corpus import synthetic_document
+
+def legacy_extract(text):
+    """
+    The previous regexes and split-then-findall structure. Two bugs are fixed
+    so the work is comparable: sections are paired as [heading, content]
+    after the preamble (the old loop was off by one and scanned only the
+    heading strings), and models are read via match.group(0) because
+    findall returns group tuples that cannot be split.
+    """
+    section_pattern = r"(?i)(?:(?:^|\n)([0-9]+\.\s+[A-Za-z]+.*))"
+    sections = re.split(section_pattern, text)
+    if len(sections) <= 1:
+        sections = ["Entire Text", text]
+    else:
+        sections = ["No Heading"] + sections
+    model_patterns = [
+        r"\bLSTM(s?)\b", r"\bCNN(s?)\b", r"\bTransformer(s?)\b", r"\bBERT(s?)\b",
+        r"\bGRU(s?)\b", r"\bRNN(s?)\b", r"\bXLNet(s?)\b", r"\bRoBERTa(s?)\b",
+        r"\bGPT(-\d?)?\b", r"\bSVM(s?)\b", r"\bRandom Forest(s?)\b", r"\bXGBoost\b",
+        r"\bLightGBM\b", r"\bCatBoost\b", r"\bKNN\b", r"\bNaive Bayes\b",
+        r"\bDecision Tree(s?)\b", r"\bLinear Regression\b", r"\bLogistic Regression\b",
+        r"\bEnsemble(s?)\b"
+    ]
+    combined_model_pattern = r"(?:" + "|".join(model_patterns) + r")"
+    combined_performance_pattern = r"(?:(accuracy|f1 score|precision|recall|auc|bleu|rouge|mse|rmse)\s*[:=]?\s*(\d+\.?\d*))"
+    section_results = {}
+    for i in range(0, len(sections), 2):
+        if i + 1 >= len(sections):
+            break
+        section_heading = sections[i].strip() if sections[i].strip() else "No Heading"
+        section_content = sections[i + 1].strip()
+        found_models = [m.group(0) for m in re.finditer(combined_model_pattern, section_content, re.IGNORECASE)]
+        unique_models = list(set(model.split("s", 1)[0] for model in found_models))
+        found_metrics = re.findall(combined_performance_pattern, section_content, re.IGNORECASE)
+        metrics_dict = {metric.lower().replace(" ", "_"): float(value) for metric, value in found_metrics}
+        section_results[section_heading] = {"models": unique_models, "metrics": metrics_dict}
+    return section_results
+
+def load_corpus(args):
+    if args.text_dir:
+        texts = []
+        for name in sorted(os.listdir(args.text_dir)):
+            if name.endswith('.txt'):
+                with open(os.path.join(args.text_dir, name), 'r', encoding='utf-8') as f:
+                    texts.append(f.read())
+        return texts
+    rng = random.Random(0)
+    return [synthetic_document(rng) for _ in range(args.documents)]
+
+def timed(func, texts):
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=300)
+    parser.add_argument('--text-dir', help='Directory of extracted .txt files')
+    args = parser.parse_args()
+
+    texts = load_corpus(args)
+    megabytes = sum(len(text.encode('utf-8')) for text in texts) / 1e6
+    extractor = ModelMetricExtractor()
+    print(f"{len(texts)} documents, {megabytes:.1f} MB of text")
+    for label, func in (('legacy', legacy_extract), ('extractor', extractor.extract)):
+        elapsed = timed(func, texts)
+        print(f"{label:10s} {elapsed:6.2f}s  {megabytes / elapsed:6.2f} MB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Wall time, throughput and peak memory of every screening stage on
+synthetic corpora (see synthetic_corpus.py).
+
+Each stage runs in a fresh process: its inputs are prepared first, then the
+stage is timed and the growth of the process's peak RSS over the level
+reached by the inputs is reported alongside the peak itself. Results are
+written as JSON so runs can be diffed or loaded into pandas. Run from the
+repository root:
+    python benchmarks/bench_pipeline.py --sizes 1000,10000 --output bench_pipeline.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aggregation import load_script
+from instrumentation import peak_rss_mb
+from synthetic_corpus import write_corpus
+
+def _files_mb(paths):
+    return sum(os.path.getsize(path) for path in paths) / 1e6
+
+def _export_paths(database_dir):
+    return [os.path.join(database_dir, name) for name in sorted(os.listdir(database_dir))]
+
+# Each setup function prepares a stage's inputs and returns
+# (run, items, megabytes); run() does the timed work and may return extra
+# fields for the report.
+
+def setup_parse_ris(paths, tmp):
+    filtering = load_script('filtering', 'filtering.py')
+    files = [path for path in _export_paths(paths['database_dir']) if path.endswith('.ris')]
+    return lambda: {'entries': sum(len(filtering.parse_export(path)) for path in files)}, None, _files_mb(files)
+
+def setup_parse_bibtex(paths, tmp):
+    acl_filtering = load_script('acl_filtering', 'acl-filtering.py')
+    path = paths['anthology']
+    return (lambda: {'entries': sum(1 for _ in acl_filtering.iter_bibtex_entries(path))},
+            None, _files_mb([path]))
+
+def setup_collect_all_papers(paths, tmp):
+    filtering = load_script('filtering', 'filtering.py')
+    def run():
+        papers, duplicates, total = filtering.collect_all_papers(paths['database_dir'])
+        return {'entries': total, 'duplicates': duplicates}
+    return run, None, _files_mb(_export_paths(paths['database_dir']))
+
+def setup_categorize_databases(paths, tmp):
+    filtering = load_script('filtering', 'filtering.py')
+    papers, _, _ = filtering.collect_all_papers(paths['database_dir'])
+    matcher = filtering.compile_patterns()
+    def run():
+        relevant = [info for info in filtering.analyze_chunk(papers, matcher) if info]
+        return {'relevant': len(relevant)}
+    return run, len(papers), None
+
+def setup_categorize_acl(paths, tmp):
+    acl_filtering = load_script('acl_filtering', 'acl-filtering.py')
+    entries = list(acl_filtering.iter_bibtex_entries(paths['anthology']))
+    matcher = acl_filtering.compile_patterns()
+    return (lambda: {'relevant': len(acl_filtering.categorize_chunk(entries, matcher))},
+            len(entries), None)
+
+def setup_write_csv_databases(paths, tmp):
+    filtering = load_script('filtering', 'filtering.py')
+    papers, _, _ = filtering.collect_all_papers(paths['database_dir'])
+    matcher = filtering.compile_patterns()
+    papers_info = [info for info in filtering.analyze_chunk(papers, matcher) if info]
+    output = os.path.join(tmp, 'screened_papers.csv')
+    def run():
+        filtering.save_paper_info_to_csv(papers_info, output)
+        return {'output_mb': round(os.path.getsize(output) / 1e6, 2)}
+    return run, len(papers_info), None
+
+def setup_write_parquet_databases(paths, tmp):
+    from columnar import ColumnarWriter
+    filtering = load_script('filtering', 'filtering.py')
+    papers, _, _ = filtering.collect_all_papers(paths['database_dir'])
+    matcher = filtering.compile_patterns()
+    papers_info = [info for info in filtering.analyze_chunk(papers, matcher) if info]
+    output = os.path.join(tmp, 'screened_papers.parquet')
+    def run():
+        with ColumnarWriter(output, filtering.COLUMNAR_COLUMNS) as writer:
+            for paper_info in papers_info:
+                writer.write(paper_info)
+        return {'output_mb': round(os.path.getsize(output) / 1e6, 2)}
+    return run, len(papers_info), None
+
+def setup_write_csv_acl(paths, tmp):
+    acl_filtering = load_script('acl_filtering', 'acl-filtering.py')
+    matcher = acl_filtering.compile_patterns()
+    papers_info = acl_filtering.categorize_chunk(acl_filtering.iter_bibtex_entries(paths['anthology']), matcher)
+    output = os.path.join(tmp, 'screened_acl_papers.csv')
+    def run():
+        acl_filtering.save_results_to_csv(papers_info, output)
+        return {'output_mb': round(os.path.getsize(output) / 1e6, 2)}
+    return run, len(papers_info), None
+
+def setup_extract_models(paths, tmp):
+    model_filtering = load_script('acl_model_filtering', 'acl-model-filtering.py')
+    files = _export_paths(paths['text_dir'])
+    texts = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    def run():
+        sections = sum(len(model_filtering.extract_performance_and_models(text)) for text in texts)
+        return {'sections': sections}
+    return run, len(texts), _files_mb(files)
+
+STAGES = {
+    'parse_ris': setup_parse_ris,
+    'parse_bibtex': setup_parse_bibtex,
+    'collect_all_papers': setup_collect_all_papers,
+    'categorize_databases': setup_categorize_databases,
+    'categorize_acl': setup_categorize_acl,
+    'write_csv_databases': setup_write_csv_databases,
+    'write_parquet_databases': setup_write_parquet_databases,
+    'write_csv_acl': setup_write_csv_acl,
+    'extract_models': setup_extract_models,
+}
+
+def run_stage(stage, paths):
+    """Run in a fresh worker process so peak RSS belongs to this stage alone."""
+    with tempfile.TemporaryDirectory() as tmp:
+        run, items, megabytes = STAGES[stage](paths, tmp)
+        baseline_mb = peak_rss_mb()
+        start = time.perf_counter()
+        extra = run()
+        seconds = time.perf_counter() - start
+        peak_mb = peak_rss_mb()
+    if items is None:
+        items = extra.get('entries', 0)
+    return {
+        'stage': stage,
+        'items': items,
+        'seconds': round(seconds, 4),
+        'items_per_second': round(items / seconds, 1) if seconds else None,
+        'mb_per_second': round(megabytes / seconds, 2) if megabytes and seconds else None,
+        'input_mb': round(megabytes, 2) if megabytes else None,
+        'peak_rss_mb': round(peak_mb, 1),
+        'stage_rss_mb': round(peak_mb - baseline_mb, 1),
+        **extra,
+    }
+
+def _optional(value, width):
+    return f"{value:{width}.2f}" if value is not None else '-'.rjust(width)
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000', help='Comma-separated entry counts, e.g. 1000,10000,100000')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--documents-per-entry', type=float, default=0.01,
+                        help='Plain-text documents generated per entry')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stages to run')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per stage; the fastest is kept')
+    parser.add_argument('--corpus-dir', help='Where to keep generated corpora between runs (default: temporary)')
+    parser.add_argument('--output', default='bench_pipeline.json')
+    args = parser.parse_args()
+
+    stages = args.stages.split(',')
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    report = {
+        'meta': {
+            'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'duplicate_rate': args.duplicate_rate,
+            'seed': args.seed,
+        },
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_root = args.corpus_dir or tmp
+        for size in (int(size) for size in args.sizes.split(',')):
+            documents = max(1, round(size * args.documents_per_entry))
+            corpus_dir = os.path.join(corpus_root, f"n{size}-dup{args.duplicate_rate}-docs{documents}-seed{args.seed}")
+            start = time.perf_counter()
+            paths = write_corpus(corpus_dir, size, args.duplicate_rate, args.seed, documents)
+            print(f"\n{size} entries ({documents} text documents), corpus ready in {time.perf_counter() - start:.1f}s")
+            print(f"{'stage':22s} {'items':>8s} {'seconds':>9s} {'items/s':>10s} {'MB/s':>7s} {'peak MB':>8s} {'stage MB':>9s}")
+            for stage in stages:
+                runs = []
+                for _ in range(args.repeat):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                        runs.append(executor.submit(run_stage, stage, paths).result())
+                result = min(runs, key=lambda r: r['seconds'])
+                result['peak_rss_mb'] = max(r['peak_rss_mb'] for r in runs)
+                result['size'] = size
+                report['results'].append(result)
+                print(f"{stage:22s} {result['items']:8d} {result['seconds']:9.3f} "
+                      f"{result['items_per_second'] or 0:10.0f} {_optional(result['mb_per_second'], 7)} "
+                      f"{result['peak_rss_mb']:8.1f} {result['stage_rss_mb']:9.1f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Peak memory of holding the screened papers as PaperRecord/AclPaperRecord
+objects versus the previous layout: one dict per paper, with filtering.py
+also collecting every deduplicated entry before classifying any of them
+(analyze_databases now streams them into classification).
+
+Each (pipeline, layout) pair runs in a fresh process on a synthetic corpus
+(see synthetic_corpus.py): the inputs are parsed, classified and written
+to CSV under tracemalloc (which slows parsing several times over).
+Reported are the Python heap still held once the CSV is written (the
+screened papers plus whatever the layout keeps alive), the heap's peak,
+and the process's peak RSS. Run from the repository root:
+    python benchmarks/bench_records.py --sizes 10000,50000
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aggregation import load_script
+from instrumentation import peak_rss_mb
+from synthetic_corpus import write_corpus
+
+LAYOUTS = ('dicts', 'records')
+
+def as_dict(record):
+    """A record in the shape extract_paper_info used to return."""
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in record.items()}
+
+def screen_databases(paths, layout, tmp):
+    filtering = load_script('filtering', 'filtering.py')
+    tracemalloc.start()
+    start = time.perf_counter()
+    if layout == 'records':
+        _, _, papers_info = filtering.analyze_databases(paths['database_dir'])
+    else:
+        papers, _, _ = filtering.collect_all_papers(paths['database_dir'])
+        matcher = filtering.compile_patterns()
+        shards = filtering.ordered_map(partial(filtering.analyze_chunk, matcher=matcher), papers, chunk_size=500)
+        papers_info = [as_dict(info) for shard in shards for info in shard if info]
+    filtering.save_paper_info_to_csv(papers_info, os.path.join(tmp, 'screened_papers.csv'))
+    return len(papers_info), time.perf_counter() - start, _heap()
+
+def screen_acl(paths, layout, tmp):
+    acl_filtering = load_script('acl_filtering', 'acl-filtering.py')
+    matcher = acl_filtering.compile_patterns()
+    tracemalloc.start()
+    start = time.perf_counter()
+    papers_info = []
+    for entry in acl_filtering.iter_bibtex_entries(paths['anthology']):
+        info = acl_filtering.screen_entry(entry, matcher)
+        if info:
+            papers_info.append(info if layout == 'records' else as_dict(info))
+    acl_filtering.save_results_to_csv(papers_info, os.path.join(tmp, 'screened_acl_papers.csv'))
+    return len(papers_info), time.perf_counter() - start, _heap()
+
+def _heap():
+    """(held, peak) bytes of the traced heap, after collecting unreachable cycles."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()
+
+PIPELINES = {'databases': screen_databases, 'acl': screen_acl}
+
+def run(pipeline, layout, paths):
+    """Run in a fresh worker process so the measurements belong to this layout alone."""
+    with tempfile.TemporaryDirectory() as tmp:
+        papers, seconds, (held, peak) = PIPELINES[pipeline](paths, layout, tmp)
+    return {'papers': papers, 'seconds': seconds, 'held_mb': held / 1024 ** 2,
+            'heap_peak_mb': peak / 1024 ** 2, 'peak_rss_mb': peak_rss_mb()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,50000', help='Comma-separated entry counts')
+    parser.add_argument('--pipelines', default=','.join(PIPELINES), help='Comma-separated pipelines to run')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus-dir', help='Where to keep generated corpora between runs (default: temporary)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_root = args.corpus_dir or tmp
+        for size in (int(size) for size in args.sizes.split(',')):
+            corpus_dir = os.path.join(corpus_root, f"n{size}-dup{args.duplicate_rate}-docs1-seed{args.seed}")
+            paths = write_corpus(corpus_dir, size, args.duplicate_rate, args.seed, documents=1)
+            print(f"\n{size} entries")
+            print(f"{'pipeline':10s} {'layout':8s} {'papers':>7s} {'seconds':>8s} {'held MB':>8s} {'heap peak':>9s} {'peak RSS':>8s}")
+            for pipeline in args.pipelines.split(','):
+                for layout in LAYOUTS:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                        result = executor.submit(run, pipeline, layout, paths).result()
+                    print(f"{pipeline:10s} {layout:8s} {result['papers']:7d} {result['seconds']:8.2f} "
+                          f"{result['held_mb']:8.1f} {result['heap_peak_mb']:9.1f} {result['peak_rss_mb']:8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Query latency of the full-text index (text_index.py) and the cost of
+rebuilding model_performance.csv from it.
+
+Synthetic documents (see synthetic_corpus.py) stand in for extracted PDF
+text. The index is built one document at a time, as acl-model-filtering.py
+feeds it; each query is then timed as the median of several runs. The
+rebuilt CSV is checked against summarize_document over the texts, which is
+also what rebuilding without the index costs on top of reopening every
+PDF. Run from the repository root:
+    python benchmarks/bench_text_index.py --documents 2000
+"""
+import argparse
+import filecmp
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aggregation import load_script
+from synthetic_corpus import synthetic_document
+from text_index import TextIndex
+
+SEARCHES = ['"random forest" AND accuracy', 'heading: results AND roberta', 'NEAR(lstm rmse, 5)',
+            'transf* NOT bert', 'empathy']
+PAPER_QUERIES = [{'model': 'RoBERTa', 'metric': 'f1_score', 'min_value': 0.7},
+                 {'query': '"random forest"', 'metric': 'accuracy', 'min_value': 0.9}]
+
+def timed(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    model_filtering = load_script('acl_model_filtering', 'acl-model-filtering.py')
+    rng = random.Random(args.seed)
+    texts = [synthetic_document(rng) for _ in range(args.documents)]
+    records = [{'path': f"paper{i:06d}.pdf", 'url': f"https://example.org/{i}"} for i in range(len(texts))]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'text_index.sqlite')
+        with TextIndex(path) as index:
+            start = time.perf_counter()
+            for i, (record, text) in enumerate(zip(records, texts)):
+                index.add(record, f"{i:064x}", text)
+            print(f"indexed {len(index)} documents in {time.perf_counter() - start:.1f}s, "
+                  f"{os.path.getsize(path) / 1024 ** 2:.1f} MB")
+
+            for query in SEARCHES:
+                results, ms = timed(lambda: index.search(query), args.repeat)
+                print(f"search {query!r:34s} {len(results):3d} sections  {ms:7.2f} ms")
+            for conditions in PAPER_QUERIES:
+                results, ms = timed(lambda: index.papers(**conditions), args.repeat)
+                print(f"papers {str(conditions):60s} {len(results):5d} papers  {ms:7.2f} ms")
+
+            start = time.perf_counter()
+            rows = model_filtering.summarize_index(index)
+            from_index = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = [model_filtering.summarize_document(record, text) for record, text in zip(records, texts)]
+        from_text = time.perf_counter() - start
+        model_filtering.save_model_performance(rows, os.path.join(tmp, 'from_index.csv'))
+        model_filtering.save_model_performance(expected, os.path.join(tmp, 'from_text.csv'))
+        assert filecmp.cmp(os.path.join(tmp, 'from_index.csv'), os.path.join(tmp, 'from_text.csv'), shallow=False)
+        print(f"model_performance rows: {from_index:.2f}s from the index, {from_text:.2f}s re-scanning the text "
+              f"(before any PDF parsing); identical CSV")
+
+if __name__ == "__main__":
+    main()
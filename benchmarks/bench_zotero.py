@@ -0,0 +1,136 @@
+"""
+Zotero item creation (boolean-search/ACL/acl_zotitem.py) against a local
+stand-in for the Zotero Web API and the paper site.
+
+The stand-in checks the API key, refuses more than 50 items per request
+and reused write tokens like the real API, and answers every request
+after a fixed latency. It compares one item per request (what the
+notebook did) with batched requests, then checks that an interrupted run
+picks up where it stopped without creating any item twice. Run from the
+repository root:
+    python benchmarks/bench_zotero.py --papers 300 --latency 0.05
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'boolean-search', 'ACL'))
+
+from acl_zotitem import MAX_ITEMS_PER_REQUEST, Ledger, ZoteroClient, create_items
+from bench_downloader import StandInServer
+from pdf_downloader import PDFDownloader
+
+API_KEY = 'stand-in-key'
+LIBRARY_ID = '1'
+
+class StandInZotero:
+    """Items created so far, write tokens seen, and requests whose response should be dropped."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.items = []
+        self.tokens = set()
+        self.requests = 0
+        self.drop_responses = set()  # Request numbers applied but answered with a dropped connection
+        self.lock = threading.Lock()
+
+def make_handler(zotero):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, content_type='application/json'):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(zotero.latency)
+            paper = self.path.strip('/').split('/')[-1]
+            self._send(200, b'%PDF-1.4\n' + paper.encode() * 64, 'application/pdf')
+
+        def do_POST(self):
+            items = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            time.sleep(zotero.latency)
+            if self.path != f"/users/{LIBRARY_ID}/items" or self.headers.get('Zotero-API-Key') != API_KEY:
+                return self._send(403, b'Forbidden', 'text/plain')
+            if len(items) > MAX_ITEMS_PER_REQUEST:
+                return self._send(413, b'Too many items', 'text/plain')
+            with zotero.lock:
+                token = self.headers.get('Zotero-Write-Token')
+                if token in zotero.tokens:
+                    return self._send(412, b'Write token already used', 'text/plain')
+                zotero.tokens.add(token)
+                zotero.requests += 1
+                successful = {}
+                for index, item in enumerate(items):
+                    key = f"K{len(zotero.items):07d}"
+                    zotero.items.append(item)
+                    successful[str(index)] = {'key': key, 'version': len(zotero.items), 'data': item}
+                drop = zotero.requests in zotero.drop_responses
+            if drop:
+                self.close_connection = True
+                return
+            self._send(200, json.dumps({'successful': successful, 'success': {
+                index: item['key'] for index, item in successful.items()}, 'unchanged': {}, 'failed': {}}).encode())
+
+    return Handler
+
+def run(papers, base_url, batch_size, retries=0):
+    with tempfile.TemporaryDirectory() as tmp:
+        client = ZoteroClient(LIBRARY_ID, API_KEY, base_url=base_url, retries=retries, backoff=0.01)
+        downloader = PDFDownloader(os.path.join(tmp, 'pdfs'), min_interval=0)
+        with Ledger(os.path.join(tmp, 'ledger.sqlite')) as ledger:
+            start = time.perf_counter()
+            counts = create_items(papers, client, ledger, downloader, batch_size)
+            return time.perf_counter() - start, counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--papers', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per API or PDF response')
+    args = parser.parse_args()
+
+    zotero = StandInZotero(args.latency)
+    server = StandInServer(('127.0.0.1', 0), make_handler(zotero))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    papers = [(f"Paper {i}", f"{base_url}/papers/{i}.pdf", 'COLLECTN') for i in range(args.papers)]
+
+    for batch_size in (1, MAX_ITEMS_PER_REQUEST):
+        zotero.items.clear()
+        elapsed, counts = run(papers, base_url, batch_size)
+        assert counts['created'] == len(zotero.items) == args.papers, (counts, len(zotero.items))
+        print(f"batch size {batch_size:2d}: {elapsed:6.2f}s  {args.papers / elapsed:7.1f} items/s")
+
+    # Lose the response of the second request, then rerun on the same ledger
+    zotero.items.clear()
+    zotero.drop_responses = {zotero.requests + 2}
+    with tempfile.TemporaryDirectory() as tmp:
+        downloader = PDFDownloader(os.path.join(tmp, 'pdfs'), min_interval=0)
+        ledger_path = os.path.join(tmp, 'ledger.sqlite')
+        client = ZoteroClient(LIBRARY_ID, API_KEY, base_url=base_url, retries=0, timeout=5)
+        with Ledger(ledger_path) as ledger:
+            first = create_items(papers, client, ledger, downloader)
+        with Ledger(ledger_path) as ledger:
+            second = create_items(papers, client, ledger, downloader)
+            created = sum(status == 'created' for status in ledger.statuses().values())
+    assert len(zotero.items) == args.papers == created, (len(zotero.items), created)
+    print(f"interrupted run: {first['created']} created, {first['interrupted']} left pending; "
+          f"rerun: {second['resent']} resent, {second['skipped']} skipped, {second['created']} created; "
+          f"{len(zotero.items)} items on the server, no duplicates")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Regression check for DuplicateIndex on title pairs taken from the screened
+output in statistics/: pairs that are the same paper must still be merged,
+pairs that are different papers must be kept apart. Run from the
+repository root:
+    python benchmarks/check_dedup.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dedup import DuplicateIndex
+
+SAME = [
+    ('Mandarin Emotion Recognition Based on Weighted Fusion Strategy',
+     'Mandarin Emotion Recognition Based on Weighted Fusion Strategegy'),
+    ('VREED: Virtual Reality Emotion Recognition Dataset Using Eye Tracking and Physiological Measures',
+     'Vreed: Virtual reality emotion recognition dataset using eye tracking & physiological measures'),
+    ('Joyful: Joint Modality Fusion and Graph Contrastive Learning for Multimodal Emotion Recognition',
+     'Joyful: Joint Modality Fusion and Graph Contrastive Learning for Multimoda Emotion Recognition'),
+    ('Alternation Across Semantic Fields: A Study on {M}andarin Verbs of Emotion',
+     'Alternation Across Semantic Fields : A Study of {M}andarin Verbs of Emotion'),
+]
+DIFFERENT = [
+    ("Proceedings of the Third Workshop on Computational Modeling of People's Opinions, Personality, "
+     "and Emotion's in Social Media",
+     "Proceedings of the Second Workshop on Computational Modeling of People{'}s Opinions, Personality, "
+     "and Emotions in Social Media"),
+    ("Proceedings of the Third Workshop on Computational Modeling of People's Opinions, Personality, "
+     "and Emotion's in Social Media",
+     "Proceedings of the Workshop on Computational Modeling of People{'}s Opinions, Personality, "
+     "and Emotions in Social Media ({PEOPLES})"),
+    ('{UCSC} {NLP} at {S}em{E}val-2024 Task 10: Emotion Discovery and Reasoning its Flip in Conversation '
+     '({ED}i{R}e{F})',
+     '{S}em{E}val 2024 - Task 10: Emotion Discovery and Reasoning its Flip in Conversation ({ED}i{R}e{F})'),
+    ('Emotion Recognition in Conversation: A Survey, Part I',
+     'Emotion Recognition in Conversation: A Survey, Part II'),
+    ('Эмоции и речь 2020', 'Эмпатия у детей 2020'),
+    ('基于BERT的情感分析', '基于BERT的共情对话生成'),
+]
+
+def main():
+    failures = []
+    for expected, pairs in ((True, SAME), (False, DIFFERENT)):
+        for kept, candidate in pairs:
+            index = DuplicateIndex()
+            index.is_duplicate({'title': kept}, 'first')
+            if index.is_duplicate({'title': candidate}, 'second') != expected:
+                failures.append(f"{'missed' if expected else 'merged'}: {candidate!r} / {kept!r}")
+    for failure in failures:
+        print(failure)
+    print(f"{len(SAME) + len(DIFFERENT) - len(failures)}/{len(SAME) + len(DIFFERENT)} pairs as expected")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Deterministic synthetic corpora for the benchmarks: database exports (RIS
+and BibTeX) with a set share of duplicate records, an ACL-style BibTeX
+anthology, and plain-text "PDF text" documents. The same size, duplicate
+rate and seed always produce byte-identical files.
+
+    python benchmarks/synthetic_corpus.py corpus-10k --entries 10000 --duplicate-rate 0.1
+"""
+import argparse
+import os
+import random
+
+import rispy
+
+WORDS = ("the of and to in a is that for we on with as are this by be from our an which results "
+         "table shows dataset baseline proposed approach utterance dialogue conversation speech "
+         "performance evaluation train test split annotators labels social media users text "
+         "multimodal analysis framework study").split()
+TOPIC_WORDS = ("emotion emotions emotional empathy empathic affective sentiment mental health "
+               "support counseling").split()
+TASK_WORDS = ("classification recognition prediction detection generation regression annotated "
+              "annotation labeled labelling corpus database data model models neural transformer "
+              "BERT training trained accuracy F1 Pearson performance").split()
+MODELS = ["BERT", "RoBERTa", "LSTMs", "CNN", "Transformers", "GPT-3", "SVM", "Random Forest", "XLNet"]
+METRICS = ["accuracy", "F1 score", "precision", "recall", "AUC"]
+JOURNALS = ["IEEE Transactions on Affective Computing", "Computational Linguistics",
+            "Language Resources and Evaluation", "Cognition and Emotion"]
+
+def _title(rng):
+    words = [rng.choice(WORDS + TASK_WORDS) for _ in range(rng.randint(5, 11))]
+    if rng.random() < 0.4:  # Enough relevant titles for categorization to do real work
+        words.insert(rng.randrange(len(words)), rng.choice(TOPIC_WORDS))
+    return ' '.join(words).capitalize()
+
+def _abstract(rng):
+    return ' '.join(rng.choice(WORDS) if rng.random() < 0.8 else rng.choice(TASK_WORDS + TOPIC_WORDS)
+                    for _ in range(rng.randint(80, 200)))
+
+def _near_duplicate_title(rng, title):
+    """A copy as another database would export it: a typo or changed punctuation."""
+    words = title.split()
+    position = rng.randrange(len(words))
+    if rng.random() < 0.5 and len(words[position]) > 3:
+        word = words[position]
+        cut = rng.randrange(1, len(word) - 1)
+        words[position] = word[:cut] + word[cut + 1:]
+    else:
+        words[position] += ':'
+    return ' '.join(words)
+
+def make_records(count, duplicate_rate=0.1, seed=0):
+    """
+    Return `count` records of which about `duplicate_rate` duplicate an
+    earlier one: a third share the title, a third the DOI (with a differently
+    cased title) and a third are near-duplicate titles without a DOI.
+    """
+    rng = random.Random(seed)
+    unique = max(1, round(count * (1 - duplicate_rate)))
+    records = []
+    for i in range(unique):
+        records.append({
+            'title': _title(rng),
+            'authors': [f"Author{rng.randrange(5000)}, {rng.choice('ABCDEFGH')}." for _ in range(rng.randint(1, 5))],
+            'year': str(rng.randint(2000, 2024)),
+            'journal': rng.choice(JOURNALS),
+            'volume': str(rng.randint(1, 40)),
+            'issue': str(rng.randint(1, 12)),
+            'doi': f"10.{1000 + i % 9000}/synthetic.{i}" if rng.random() < 0.7 else '',
+            'abstract': _abstract(rng) if rng.random() < 0.95 else '',
+            'keywords': rng.sample(TASK_WORDS, 3),
+            'url': f"https://example.org/paper/{i}",
+        })
+    for _ in range(count - unique):
+        original = rng.choice(records[:unique])
+        copy = dict(original, authors=list(original['authors']), keywords=list(original['keywords']))
+        kind = rng.randrange(3)
+        if kind == 1 and copy['doi']:
+            copy['title'] = copy['title'].upper()
+        elif kind == 2:
+            copy['title'] = _near_duplicate_title(rng, copy['title'])
+            copy['doi'] = ''
+        records.append(copy)
+    rng.shuffle(records)
+    return records
+
+def write_ris(records, path):
+    entries = [{'type_of_reference': 'JOUR', 'title': r['title'], 'authors': r['authors'],
+                'year': r['year'], 'journal_name': r['journal'], 'volume': r['volume'],
+                'number': r['issue'], 'doi': r['doi'], 'abstract': r['abstract'],
+                'keywords': r['keywords'], 'urls': [r['url']]} for r in records]
+    for entry in entries:
+        for field in ('doi', 'abstract'):
+            if not entry[field]:
+                del entry[field]
+    with open(path, 'w', encoding='utf-8') as f:
+        rispy.dump(entries, f)
+
+def _bibtex_value(value):
+    return value.replace('{', '').replace('}', '').replace('"', "'")
+
+def write_bibtex(records, path, key_prefix='paper'):
+    """Write records in the ACL anthology's layout (multi-line author lists, @string months)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('@string{acl = "Association for Computational Linguistics"}\n\n')
+        for i, r in enumerate(records):
+            fields = [('title', _bibtex_value(r['title'])),
+                      ('author', '  and\n      '.join(r['authors'])),
+                      ('booktitle', _bibtex_value(r['journal'])),
+                      ('year', r['year']),
+                      ('url', r['url'])]
+            if r['doi']:
+                fields.append(('doi', r['doi']))
+            if r['abstract']:
+                fields.append(('abstract', r['abstract']))
+            body = ''.join(f'    {name} = "{value}",\n' for name, value in fields)
+            f.write(f"@inproceedings{{{key_prefix}{i},\n{body}    month = may,\n    publisher = acl,\n}}\n")
+
+def write_database_dir(directory, count, duplicate_rate=0.1, seed=0, databases=4):
+    """
+    Spread the records round-robin over `databases` exports (all RIS but the
+    last, which is BibTeX) so duplicates cross database boundaries.
+    """
+    os.makedirs(directory, exist_ok=True)
+    records = make_records(count, duplicate_rate, seed)
+    paths = []
+    for n in range(databases):
+        part = records[n::databases]
+        if n == databases - 1:
+            path = os.path.join(directory, f"database{n}.bib")
+            write_bibtex(part, path, key_prefix=f"db{n}-")
+        else:
+            path = os.path.join(directory, f"database{n}.ris")
+            write_ris(part, path)
+        paths.append(path)
+    return paths
+
+def synthetic_document(rng, paragraphs=40):
+    parts = []
+    for section, heading in enumerate(["Introduction", "Related Work", "Methods", "Experiments",
+                                       "Results", "Conclusion"], start=1):
+        parts.append(f"\n{section}. {heading}\n")
+        for _ in range(paragraphs // 6):
+            words = [rng.choice(WORDS) for _ in range(120)]
+            for _ in range(3):
+                words.insert(rng.randrange(len(words)), rng.choice(MODELS))
+            words.insert(rng.randrange(len(words)), f"{rng.choice(METRICS)}: {rng.uniform(0, 1):.3f}")
+            parts.append(' '.join(words) + '\n')
+    return ''.join(parts)
+
+def write_text_corpus(directory, count, seed=0):
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"paper{i:06d}.txt")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(synthetic_document(rng))
+        paths.append(path)
+    return paths
+
+def write_corpus(directory, entries, duplicate_rate=0.1, seed=0, documents=None):
+    """
+    Write every corpus the pipeline benchmark needs under `directory` and
+    return their paths. Files already there are reused, since the output
+    only depends on the arguments (which are part of the directory name
+    chosen by the caller).
+    """
+    paths = {'database_dir': os.path.join(directory, 'databases'),
+             'anthology': os.path.join(directory, 'anthology.bib'),
+             'text_dir': os.path.join(directory, 'texts')}
+    done_marker = os.path.join(directory, '.complete')
+    if os.path.exists(done_marker):
+        return paths
+    documents = documents if documents is not None else max(1, entries // 100)
+    write_database_dir(paths['database_dir'], entries, duplicate_rate, seed)
+    write_bibtex(make_records(entries, duplicate_rate, seed + 1), paths['anthology'])
+    write_text_corpus(paths['text_dir'], documents, seed)
+    open(done_marker, 'w').close()
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a deterministic synthetic corpus.')
+    parser.add_argument('directory')
+    parser.add_argument('--entries', type=int, default=1000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--documents', type=int, help='Plain-text documents (default: entries / 100)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    paths = write_corpus(args.directory, args.entries, args.duplicate_rate, args.seed, args.documents)
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+
+if __name__ == "__main__":
+    main()
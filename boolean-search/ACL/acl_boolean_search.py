@@ -0,0 +1,153 @@
+"""
+Boolean search over the ACL anthology, as in acl_boolean_search.ipynb, with
+the DataFrame built in one go and eldar queries evaluated column-wise.
+
+    python acl_boolean_search.py anthology+abstracts.bib
+
+With --index the entries are kept in the repository's persistent inverted
+index and the queries are answered from posting lists instead.
+"""
+import argparse
+import os
+import re
+import sys
+
+import bibtexparser
+import pandas as pd
+from eldar import Query
+from eldar.entry import Entry
+from eldar.operators import AND, ANDNOT, OR
+from unidecode import unidecode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+from incremental import record_key
+from inverted_index import InvertedIndex
+
+COLUMNS = ['title', 'author', 'booktitle', 'year', 'url', 'abstract']
+EMPATHY_QUERY = 'empath* AND (detect* OR recog* OR predict* OR classi*)'
+EMOTION_QUERY = 'emot* AND (detect* OR recog* OR predict* OR classi*)'
+
+def load_bib_entries(bib_path):
+    with open(bib_path) as bib_file:
+        return bibtexparser.load(bib_file).entries
+
+def entries_to_frame(entries):
+    """Build the search frame from parsed entries in a single allocation."""
+    df = pd.DataFrame.from_records(
+        ([entry.get(column, "") for column in COLUMNS] for entry in entries), columns=COLUMNS)
+    df['title-abstract'] = df['title'].astype(str) + " " + df['abstract'].astype(str)
+    return df
+
+class VectorQuery:
+    """
+    Evaluate an eldar query over a whole text column at once.
+
+    The query is parsed by eldar itself, so operator precedence is identical;
+    each term then becomes one vectorized regex over the preprocessed column.
+    With match_word, eldar tokenizes documents into maximal word runs, so a
+    term matches when it starts a word run (and, without a wildcard, ends one).
+    """
+
+    def __init__(self, query, ignore_case=True, ignore_accent=True, match_word=True):
+        self.query = query
+        self.ignore_case = ignore_case
+        self.ignore_accent = ignore_accent
+        self.match_word = match_word
+        self.tree = Query(query, ignore_case=ignore_case, ignore_accent=ignore_accent,
+                          match_word=match_word).query
+
+    def preprocess(self, texts):
+        # Object dtype keeps matching on Python's re whatever the string backend
+        texts = texts.astype(str).astype(object)
+        if self.ignore_case:
+            texts = texts.str.lower()
+        if self.ignore_accent:
+            # unidecode is only needed (and only slow) for non-ASCII rows
+            non_ascii = ~texts.str.isascii()
+            if non_ascii.any():
+                texts = texts.copy()
+                texts[non_ascii] = texts[non_ascii].map(unidecode)
+        return texts
+
+    def _term_pattern(self, entry):
+        if entry.rgx is not None:
+            pattern = entry.rgx.pattern
+            return rf'(?<!\w){pattern}' if self.match_word else f'^{pattern}'
+        if self.match_word:
+            return rf'(?<!\w){re.escape(entry.query)}(?!\w)'
+        return re.escape(entry.query)
+
+    def _evaluate(self, node, texts):
+        if isinstance(node, Entry):
+            mask = texts.str.contains(self._term_pattern(node), regex=True)
+            return ~mask if node.not_ else mask
+        left = self._evaluate(node.left, texts)
+        right = self._evaluate(node.right, texts)
+        if isinstance(node, AND):
+            return left & right
+        if isinstance(node, ANDNOT):
+            return left & ~right
+        if isinstance(node, OR):
+            return left | right
+        raise TypeError(f"Unsupported query node: {node!r}")
+
+    def mask(self, texts, preprocessed=False):
+        """Boolean Series: which texts satisfy the query."""
+        return self._evaluate(self.tree, texts if preprocessed else self.preprocess(texts))
+
+    def __call__(self, texts):
+        return self.mask(texts)
+
+def search(df, queries, column='title-abstract', **query_options):
+    """Return {query: matching rows}, preprocessing the column only once."""
+    compiled = [VectorQuery(query, **query_options) for query in queries]
+    texts = compiled[0].preprocess(df[column]) if compiled else None
+    return {query.query: df[query.mask(texts, preprocessed=True)] for query in compiled}
+
+def index_keys(entries):
+    """Record keys, with repeats numbered the way InvertedIndex.update does."""
+    counts = {}
+    keys = []
+    for entry in entries:
+        key = record_key(entry)
+        count = counts.get(key, 0)
+        counts[key] = count + 1
+        keys.append(f"{key}#{count}" if count else key)
+    return keys
+
+def index_search(df, entries, queries, index):
+    """
+    Like search(), but updates `index` with the entries and queries it.
+    Entries are keyed by incremental.record_key, as acl-filtering.py --index
+    keys them, so both tools can share one index file.
+    """
+    index.update(zip((record_key(entry) for entry in entries), entries), prune=True)
+    keys = pd.Series(index_keys(entries), index=df.index)
+    return {query: df[keys.isin(index.search(query))] for query in queries}
+
+def main():
+    parser = argparse.ArgumentParser(description='Boolean search over the ACL anthology BibTeX export.')
+    parser.add_argument('bib_path', nargs='?', default='anthology+abstracts.bib')
+    parser.add_argument('--all-csv', default='acl_all_080524.csv')
+    parser.add_argument('--index', help='Inverted index file to update and query')
+    args = parser.parse_args()
+
+    entries = load_bib_entries(args.bib_path)
+    df = entries_to_frame(entries)
+    print(f"Number of items: {len(df)}")  # hasan et al.: 46079
+    df.to_csv(args.all_csv, index=False)
+
+    queries = [EMPATHY_QUERY, EMOTION_QUERY]
+    if args.index:
+        with InvertedIndex(args.index) as index:
+            results = index_search(df, entries, queries, index)
+    else:
+        results = search(df, queries)
+    emp_res, emo_res = results[EMPATHY_QUERY], results[EMOTION_QUERY]
+    print("Empathy-related papers found:", emp_res.shape[0])
+    print("Emotion-related papers found:", emo_res.shape[0])
+    emp_res.to_csv('acl_empathy_related_papers.csv', index=False)
+    emo_res.to_csv('acl_emotion_related_papers.csv', index=False)
+
+if __name__ == "__main__":
+    main()
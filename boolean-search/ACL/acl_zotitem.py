@@ -0,0 +1,308 @@
+"""
+Create the Zotero items of acl_zotitem.ipynb in batches.
+
+    export ZOTERO_API_KEY=...        # or "api_key" in a --config JSON file
+    python acl_zotitem.py --library-id 11521923 \
+        acl_empathy_related_papers.csv:UVBUPT6S acl_emotion_related_papers.csv:EZCWNT3L
+
+As in the notebook, a paper gets a Zotero item in its collection once its
+PDF is on disk. PDFs are fetched with the repository's PDFDownloader while
+earlier items are being uploaded, and items are created up to 50 per
+request, the Web API's maximum. A SQLite ledger records every item before
+its request is sent and once it is created, so a rerun only creates what
+is missing and resends an interrupted request under its original write
+token, which Zotero will not apply twice.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+from parallel import iter_chunks
+from pdf_downloader import PDFDownloader
+
+API_URL = 'https://api.zotero.org'
+MAX_ITEMS_PER_REQUEST = 50
+DEFAULT_LEDGER_PATH = 'zotero_ledger.sqlite'
+DEFAULT_DOWNLOAD_DIR = 'ACL-PDF'
+TAGS = [{'tag': 'Auto Downloaded'}, {'tag': 'Python Script'}]
+RETRY_STATUSES = {409, 429, 500, 502, 503, 504}  # 409: the library is locked by another write
+# Settings read from the environment, overriding the --config file
+ENVIRONMENT = {'api_key': 'ZOTERO_API_KEY', 'library_id': 'ZOTERO_LIBRARY_ID',
+               'library_type': 'ZOTERO_LIBRARY_TYPE', 'base_url': 'ZOTERO_BASE_URL'}
+
+class WriteTokenUsed(Exception):
+    """Zotero has already applied a request with this write token (HTTP 412)."""
+
+def make_item(title, url, collection):
+    return {
+        'itemType': 'journalArticle',
+        'title': title,
+        'url': url,
+        'collections': [collection],
+        'tags': TAGS
+    }
+
+class ZoteroClient:
+    """Create items through the Zotero Web API v3, or a stand-in for it at `base_url`."""
+
+    def __init__(self, library_id, api_key, library_type='user', base_url=API_URL, retries=4,
+                 backoff=1.0, timeout=60):
+        self.items_url = f"{base_url.rstrip('/')}/{library_type}s/{library_id}/items"
+        self.api_key = api_key
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        """One session per uploading thread; requests sessions are not thread-safe."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'Zotero-API-Key': self.api_key, 'Zotero-API-Version': '3'})
+            self._local.session = session
+        return session
+
+    def create_items(self, items, write_token):
+        """
+        POST up to MAX_ITEMS_PER_REQUEST items and return the API's
+        {'successful': {index: item}, 'unchanged': {index: key}, 'failed': {index: error}}.
+        Retries reuse the write token, so a request that was applied but
+        whose response got lost raises WriteTokenUsed instead of duplicating.
+        """
+        if len(items) > MAX_ITEMS_PER_REQUEST:
+            raise ValueError(f"At most {MAX_ITEMS_PER_REQUEST} items per request, got {len(items)}")
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            try:
+                response = self.session.post(self.items_url, json=items, timeout=self.timeout,
+                                             headers={'Zotero-Write-Token': write_token})
+            except requests.RequestException:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code == 412:
+                    raise WriteTokenUsed(write_token)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response.json()
+                delay = float(response.headers.get('Retry-After', delay))
+            time.sleep(delay)
+
+class Ledger:
+    """
+    SQLite record of the items this script creates, one row per (url,
+    collection). Rows are stored as 'pending' with their request's write
+    token before it is sent, then marked 'created' (with the item key when
+    Zotero returned one) or 'failed'.
+    """
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS items (
+                url TEXT NOT NULL,
+                collection TEXT NOT NULL,
+                title TEXT NOT NULL,
+                status TEXT NOT NULL,
+                item_key TEXT,
+                write_token TEXT,
+                error TEXT,
+                updated REAL NOT NULL,
+                PRIMARY KEY (url, collection)
+            );
+        ''')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def statuses(self):
+        return {(url, collection): status for url, collection, status in
+                self.conn.execute('SELECT url, collection, status FROM items')}
+
+    def pending_batches(self):
+        """{write_token: [(title, url, collection)]} of requests an earlier run did not finish."""
+        batches = {}
+        for token, title, url, collection in self.conn.execute(
+                "SELECT write_token, title, url, collection FROM items WHERE status = 'pending' ORDER BY rowid"):
+            batches.setdefault(token, []).append((title, url, collection))
+        return batches
+
+    def _update(self, rows, status, error=None):
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE items SET status = ?, error = ?, updated = ? WHERE url = ? AND collection = ?',
+                [(status, error, time.time(), url, collection) for _, url, collection in rows])
+
+    def begin(self, rows, write_token):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, 'pending', NULL, ?, NULL, ?)",
+                [(url, collection, title, write_token, time.time()) for title, url, collection in rows])
+
+    def finish(self, rows, response):
+        """Record the outcome of every row from the API response; returns counts by status."""
+        keys = {int(index): item['key'] for index, item in response.get('successful', {}).items()}
+        keys.update((int(index), key) for index, key in response.get('unchanged', {}).items())
+        failed = {int(index): error for index, error in response.get('failed', {}).items()}
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE items SET status = ?, item_key = ?, error = ?, updated = ? WHERE url = ? AND collection = ?',
+                [('failed' if index in failed else 'created', keys.get(index),
+                  failed[index].get('message') if index in failed else None, time.time(), url, collection)
+                 for index, (_, url, collection) in enumerate(rows)])
+        return Counter(created=len(rows) - len(failed), failed=len(failed))
+
+    def mark_created(self, rows):
+        """An earlier attempt with the same write token was applied; its keys are unknown."""
+        self._update(rows, 'created')
+
+    def mark_failed(self, rows, error):
+        self._update(rows, 'failed', error=error)
+
+    def failures(self):
+        return self.conn.execute(
+            "SELECT title, url, collection, error FROM items WHERE status = 'failed' ORDER BY rowid").fetchall()
+
+def load_papers(sources):
+    """[(title, url, collection)] from (csv_path, collection) pairs, skipping rows without a URL."""
+    papers = []
+    for csv_path, collection in sources:
+        df = pd.read_csv(csv_path)
+        papers.extend((row.title, row.url, collection) for row in df.dropna(subset=['url']).itertuples())
+    return list(dict.fromkeys(papers))
+
+def create_items(papers, client, ledger, downloader, batch_size=MAX_ITEMS_PER_REQUEST, upload_workers=1):
+    """
+    Download the PDFs of `papers` ([(title, url, collection)]) and create an
+    item for each one that downloaded, skipping papers the ledger already has.
+    PDFs are fetched batch_size papers at a time while the previous batch's
+    items are uploaded by `upload_workers` threads. Returns counts by outcome.
+    """
+    batch_size = min(batch_size, MAX_ITEMS_PER_REQUEST)
+    counts = Counter()
+    in_flight = {}
+
+    def submit(rows, write_token=None):
+        write_token = write_token or uuid.uuid4().hex
+        ledger.begin(rows, write_token)
+        items = [make_item(*row) for row in rows]
+        in_flight[uploads.submit(client.create_items, items, write_token)] = rows
+
+    def collect(timeout=0):
+        """Record finished uploads; the ledger is only ever touched from this thread."""
+        finished, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in finished:
+            rows = in_flight.pop(future)
+            try:
+                counts.update(ledger.finish(rows, future.result()))
+            except WriteTokenUsed:
+                ledger.mark_created(rows)
+                counts['created'] += len(rows)
+            except requests.HTTPError as e:
+                ledger.mark_failed(rows, str(e))
+                counts['failed'] += len(rows)
+            except requests.RequestException:
+                # The request may or may not have been applied: leave the rows
+                # pending so the next run resends them under the same token
+                counts['interrupted'] += len(rows)
+
+    statuses = ledger.statuses()
+    counts['skipped'] = sum(statuses.get((url, collection)) == 'created' for _, url, collection in papers)
+    todo = [paper for paper in papers if statuses.get((paper[1], paper[2])) not in ('created', 'pending')]
+    with ThreadPoolExecutor(max_workers=upload_workers) as uploads:
+        # Requests an earlier run did not finish go first, under their original token
+        for write_token, rows in ledger.pending_batches().items():
+            submit(rows, write_token)
+            counts['resent'] += len(rows)
+
+        ready = []
+        for chunk in iter_chunks(todo, batch_size):
+            records = downloader.download_all(url for _, url, _ in chunk)
+            downloaded = {record['url'] for record in records if record['status'] == 'ok'}
+            for title, url, collection in chunk:
+                if url in downloaded:
+                    ready.append((title, url, collection))
+                else:
+                    counts['download_failed'] += 1
+            while len(ready) >= batch_size:
+                submit(ready[:batch_size])
+                ready = ready[batch_size:]
+            collect()
+        if ready:
+            submit(ready)
+        while in_flight:
+            collect(timeout=None)
+    return counts
+
+def load_config(path=None, overrides=None):
+    """Defaults, then the --config JSON file, then ZOTERO_* environment variables, then flags."""
+    config = {'library_type': 'user', 'base_url': API_URL}
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    config.update({key: os.environ[name] for key, name in ENVIRONMENT.items() if os.environ.get(name)})
+    config.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return config
+
+def parse_source(source):
+    csv_path, separator, collection = source.rpartition(':')
+    if not separator or not csv_path or not collection:
+        raise argparse.ArgumentTypeError(f"expected CSV:COLLECTION, got {source!r}")
+    return csv_path, collection
+
+def main():
+    parser = argparse.ArgumentParser(description='Create Zotero items for the ACL search results in batches.')
+    parser.add_argument('sources', nargs='+', type=parse_source, metavar='CSV:COLLECTION',
+                        help='Search results and the key of the collection their items go to')
+    parser.add_argument('--config', help='JSON file with api_key, library_id, library_type and base_url')
+    parser.add_argument('--library-id', help='Zotero user or group ID')
+    parser.add_argument('--library-type', choices=['user', 'group'])
+    parser.add_argument('--base-url', help='API root, e.g. a local stand-in for testing')
+    parser.add_argument('--ledger', default=DEFAULT_LEDGER_PATH, help='SQLite record of created items')
+    parser.add_argument('--download-dir', default=DEFAULT_DOWNLOAD_DIR, help='Where the PDFs are stored')
+    parser.add_argument('--download-workers', type=int, default=8)
+    parser.add_argument('--upload-workers', type=int, default=1,
+                        help='Concurrent item requests (Zotero locks a library during each write)')
+    parser.add_argument('--batch-size', type=int, default=MAX_ITEMS_PER_REQUEST,
+                        help=f'Items per request, at most {MAX_ITEMS_PER_REQUEST}')
+    args = parser.parse_args()
+
+    config = load_config(args.config, {'library_id': args.library_id, 'library_type': args.library_type,
+                                       'base_url': args.base_url})
+    if not config.get('api_key') or not config.get('library_id'):
+        parser.error('set ZOTERO_API_KEY and ZOTERO_LIBRARY_ID (or api_key and library_id in --config)')
+
+    client = ZoteroClient(config['library_id'], config['api_key'], config['library_type'], config['base_url'])
+    downloader = PDFDownloader(args.download_dir, workers=args.download_workers)
+    papers = load_papers(args.sources)
+    start = time.perf_counter()
+    with Ledger(args.ledger) as ledger:
+        counts = create_items(papers, client, ledger, downloader, args.batch_size, args.upload_workers)
+        for title, url, collection, error in ledger.failures():
+            print(f"Failed to create {title} ({url}) in {collection}: {error}")
+    print(f"{len(papers)} papers in {time.perf_counter() - start:.1f}s: {counts['created']} items created, "
+          f"{counts['skipped']} already created, {counts['failed']} rejected, "
+          f"{counts['download_failed']} PDFs not downloaded, {counts['interrupted']} left for the next run")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import os
+import re
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed when columnar output is requested
+    pa = pq = None
+
+FEATHER_EXTENSIONS = ('.feather', '.arrow')
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Columnar output needs pyarrow: pip install pyarrow")
+
+def _file_format(path):
+    return 'feather' if path.endswith(FEATHER_EXTENSIONS) else 'parquet'
+
+def arrow_schema(columns):
+    """Build the Arrow schema for [(name, kind)] with kind 'string', 'list' or 'bool'."""
+    _require_pyarrow()
+    types = {'string': pa.string(), 'list': pa.list_(pa.string()), 'bool': pa.bool_()}
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+def _as_list(value, separator):
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    if not value:
+        return []
+    return [item.strip() for item in re.split(separator, str(value))] if separator else [str(value)]
+
+class ColumnarWriter:
+    """
+    Stream screened papers to Parquet or Feather (chosen by the extension)
+    one row group at a time, keeping real list and boolean columns.
+
+    `columns` is [(name, kind)] with kind 'string', 'list' or 'bool'. String
+    values given for list columns are split on the regex
+    `list_separators[name]`.
+    """
+
+    def __init__(self, path, columns, list_separators=None, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        _require_pyarrow()
+        self.path = path
+        self.columns = list(columns)
+        self.list_separators = list_separators or {}
+        self.row_group_size = row_group_size
+        self.schema = arrow_schema(self.columns)
+        self.rows = 0
+        self._buffers = {name: [] for name, _ in self.columns}
+        temp_path = f"{path}.part"
+        if _file_format(path) == 'feather':
+            self._sink = pa.OSFile(temp_path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+        else:
+            self._sink = None
+            self._writer = pq.ParquetWriter(temp_path, self.schema, compression='zstd')
+        self._temp_path = temp_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row):
+        for name, kind in self.columns:
+            value = row.get(name)
+            if kind == 'list':
+                value = _as_list(value, self.list_separators.get(name))
+            elif kind == 'bool':
+                value = bool(value)
+            else:
+                value = '' if value is None else str(value)
+            self._buffers[name].append(value)
+        self.rows += 1
+        if len(self._buffers[self.columns[0][0]]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffers[self.columns[0][0]]:
+            return
+        batch = pa.record_batch([self._buffers[name] for name, _ in self.columns], schema=self.schema)
+        self._writer.write_batch(batch)
+        self._buffers = {name: [] for name, _ in self.columns}
+
+    def close(self):
+        """Flush the last row group and move the file into place."""
+        self._flush()
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        os.remove(self._temp_path)
+
+def load_columns(path, columns=None, as_pandas=False):
+    """
+    Read selected columns of a file written by ColumnarWriter, memory-mapped:
+    Feather columns are used in place, Parquet pages are decoded from the
+    mapped file, and unselected columns are never read.
+    """
+    _require_pyarrow()
+    if _file_format(path) == 'feather':
+        # The table's buffers keep the mapping alive, so the file is not closed here
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    else:
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas() if as_pandas else table
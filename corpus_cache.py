@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = 'parsed_corpus_cache.sqlite'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+def file_sha256(file_path, block_size=1 << 20):
+    """Hash a file in blocks so large exports are never read into memory at once."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class CorpusCache:
+    """
+    SQLite cache of parsed bibliography entries, one row set per export file.
+
+    A file is looked up by path; the cached entries are reused when size and
+    mtime still match, or when they changed but the content hash did not
+    (e.g. the export was copied or touched). Anything else is re-parsed.
+    Once the cache grows past `max_bytes`, entries for exports that no longer
+    exist are dropped first, then the least recently used ones.
+
+    `schema` identifies what the stored entries hold (e.g. a hash of the
+    fields kept and a parser version); opening a cache written under another
+    schema empties it, so changed parsing never serves old entries.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, schema=''):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.schema = schema
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                path TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (path, position)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        ''')
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+        if row is None or row[0] != schema:
+            self.invalidate()
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (schema,))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_fresh(self, file_path):
+        """
+        True when the cached entries of `file_path` can be used as they are.
+        Refreshes the stored size and mtime when only those changed.
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        row = self.conn.execute(
+            'SELECT size, mtime_ns, sha256 FROM files WHERE path = ?', (key,)).fetchone()
+        if row is None:
+            return False
+        fresh = (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns) or file_sha256(file_path) == row[2]
+        if fresh:
+            with self.conn:
+                self.conn.execute(
+                    'UPDATE files SET size = ?, mtime_ns = ?, last_used = ? WHERE path = ?',
+                    (stat.st_size, stat.st_mtime_ns, time.time(), key))
+        return fresh
+
+    def entries(self, file_path):
+        """The cached entries of `file_path`; check is_fresh() first."""
+        return [json.loads(data) for (data,) in self.conn.execute(
+            'SELECT data FROM entries WHERE path = ? ORDER BY position', (os.path.abspath(file_path),))]
+
+    def store(self, file_path, entries):
+        """Replace the cached entries of `file_path` with `entries`."""
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        rows = [(key, position, json.dumps(entry)) for position, entry in enumerate(entries)]
+        with self.conn:
+            self.conn.execute('DELETE FROM entries WHERE path = ?', (key,))
+            self.conn.executemany('INSERT INTO entries VALUES (?, ?, ?)', rows)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)',
+                (key, stat.st_size, stat.st_mtime_ns, file_sha256(file_path),
+                 sum(len(row[2]) for row in rows), time.time()))
+        self.evict(keep=(key,))
+
+    def invalidate(self, file_path=None):
+        """Forget one export, or everything when no path is given."""
+        with self.conn:
+            if file_path is None:
+                self.conn.execute('DELETE FROM entries')
+                self.conn.execute('DELETE FROM files')
+            else:
+                key = os.path.abspath(file_path)
+                self.conn.execute('DELETE FROM entries WHERE path = ?', (key,))
+                self.conn.execute('DELETE FROM files WHERE path = ?', (key,))
+
+    def evict(self, keep=()):
+        """Shrink the cache below max_bytes, oldest and vanished exports first."""
+        total = self.conn.execute('SELECT COALESCE(SUM(bytes), 0) FROM files').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        candidates = self.conn.execute('SELECT path, bytes FROM files ORDER BY last_used').fetchall()
+        candidates.sort(key=lambda row: os.path.exists(row[0]))  # Stable: missing files first
+        for path, size in candidates:
+            if total <= self.max_bytes:
+                break
+            if path in keep:
+                continue
+            self.invalidate(path)
+            total -= size
+        self.conn.execute('VACUUM')
@@ -0,0 +1,177 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_LATEX_COMMAND = re.compile(r'\\(?:[A-Za-z]+|.)')
+_NON_WORD = re.compile(r'[\W_]+')
+_ORDINALS = frozenset(['first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth',
+                       'tenth', 'eleventh', 'twelfth', 'thirteenth', 'fourteenth', 'fifteenth', 'sixteenth',
+                       'seventeenth', 'eighteenth', 'nineteenth', 'twentieth'])
+_ROMAN = re.compile(r'(?=[ivx])x{0,3}(?:ix|iv|v?i{0,3})')
+_DOI_PREFIX = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+
+def normalize_title(title):
+    """
+    Lowercase a title and drop LaTeX markup, accents, punctuation and extra
+    whitespace. Letters of every script are kept, so Cyrillic or CJK titles
+    do not collapse to their digits.
+    """
+    title = _LATEX_COMMAND.sub('', title).replace('{', '').replace('}', '')
+    if not title.isascii():
+        title = unicodedata.normalize('NFKD', title)
+        title = ''.join(c for c in title if not unicodedata.combining(c))
+    return _NON_WORD.sub(' ', title.lower()).strip()
+
+def title_markers(normalized):
+    """
+    Words of a normalized title that tell editions and parts apart: numbers,
+    ordinals ("second", "3rd") and roman numerals up to xxxix.
+    """
+    return tuple(word for word in normalized.split()
+                 if word in _ORDINALS or _ROMAN.fullmatch(word) or any(c.isdigit() for c in word))
+
+def normalize_doi(doi):
+    return _DOI_PREFIX.sub('', doi.strip()).lower()
+
+def shingles(text):
+    """
+    Character 3-grams of a normalized title, three 21-bit code points packed
+    into each int. Returned as a sorted array of distinct values.
+    """
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < 3:
+        return np.unique(codes)
+    return np.unique((codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:])
+
+class DuplicateIndex:
+    """
+    Find duplicates among records in roughly linear time.
+
+    Records are checked in order and the first occurrence survives. A record
+    is a duplicate when it shares (in this order) its lowercased title, DOI or
+    normalized title with an earlier survivor; these are the exact matches.
+    Otherwise a MinHash signature over title character shingles is split into
+    LSH bands, and survivors sharing a band are verified by their shingle
+    Jaccard similarity; these are the fuzzy matches. A fuzzy match also
+    needs the same numbers, ordinals and roman numerals in both titles, so
+    yearly editions, "Second"/"Third Workshop" and "Part I"/"Part II" stay
+    apart, and neither title may merely sit inside the other, so "Team at
+    <shared task title>" is not merged into the task overview. Keeping a
+    duplicate is cheaper than dropping a distinct paper.
+    """
+
+    EXACT_REASONS = ('title', 'doi', 'normalized_title')
+
+    def __init__(self, threshold=0.85, num_perm=64, bands=16, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+        self._by_title = {}
+        self._by_doi = {}
+        self._by_normalized = {}
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        # (database, title, normalized title, shingles as packed bytes, markers); bytes
+        # take a tenth of the memory of a set of ints
+        self._survivors = []
+        self.duplicates = []
+        self.counts = defaultdict(int)
+
+    def _signature(self, grams):
+        # Packed 3-grams times 61-bit coefficients wrap in uint64, which is fine:
+        # the result only needs to be a fixed pseudo-random permutation
+        return ((np.outer(self._a, grams) + self._b[:, None]) % _MERSENNE_PRIME).min(axis=1)
+
+    def _band_keys(self, signature):
+        signature = signature.tobytes()
+        width = len(signature) // self.bands
+        return [signature[band * width:(band + 1) * width] for band in range(self.bands)]
+
+    def _fuzzy_match(self, normalized, grams, markers, band_keys):
+        seen = set()
+        for buckets, key in zip(self._buckets, band_keys):
+            for survivor_id in buckets.get(key, ()):
+                if survivor_id in seen:
+                    continue
+                seen.add(survivor_id)
+                _, _, other, other_grams, other_markers = self._survivors[survivor_id]
+                if other_markers != markers:
+                    continue
+                other_grams = np.frombuffer(other_grams, dtype=np.uint64)
+                shared = len(np.intersect1d(grams, other_grams, assume_unique=True))
+                similarity = shared / (len(grams) + len(other_grams) - shared)
+                if similarity < self.threshold:
+                    continue
+                shorter, longer = sorted((normalized, other), key=len)
+                if f" {shorter} " in f" {longer} ":
+                    continue
+                return survivor_id
+        return None
+
+    def _duplicate(self, survivor_id, database_name, title, reason):
+        kept_database, kept_title, _, _, _ = self._survivors[survivor_id]
+        self.counts[reason] += 1
+        self.duplicates.append({
+            'database': database_name,
+            'title': title,
+            'kept_database': kept_database,
+            'kept_title': kept_title,
+            'reason': reason
+        })
+        return True
+
+    def is_duplicate(self, entry, database_name):
+        """Check a record against earlier survivors; unique records become survivors."""
+        title = entry.get('title', '')
+        lowered = title.lower()
+        doi = normalize_doi(entry.get('doi', ''))
+        normalized = normalize_title(title)
+
+        if lowered in self._by_title:
+            return self._duplicate(self._by_title[lowered], database_name, title, 'title')
+        if doi and doi in self._by_doi:
+            return self._duplicate(self._by_doi[doi], database_name, title, 'doi')
+        if normalized and normalized in self._by_normalized:
+            return self._duplicate(self._by_normalized[normalized], database_name, title, 'normalized_title')
+
+        band_keys = []
+        grams = np.empty(0, dtype=np.uint64)
+        markers = title_markers(normalized)
+        if normalized:
+            grams = shingles(normalized)
+            band_keys = self._band_keys(self._signature(grams))
+        survivor_id = self._fuzzy_match(normalized, grams, markers, band_keys)
+        if survivor_id is not None:
+            return self._duplicate(survivor_id, database_name, title, 'fuzzy_title')
+
+        survivor_id = len(self._survivors)
+        self._survivors.append((database_name, title, normalized, grams.tobytes(), markers))
+        self._by_title[lowered] = survivor_id
+        if doi:
+            self._by_doi.setdefault(doi, survivor_id)
+        if normalized:
+            self._by_normalized.setdefault(normalized, survivor_id)
+        for buckets, key in zip(self._buckets, band_keys):
+            buckets[key].append(survivor_id)
+        return False
+
+    @property
+    def signature(self):
+        """The parameters and word rules duplicate decisions depend on, for callers that cache them."""
+        return [self.threshold, self.num_perm, self.bands, self.seed, sorted(_ORDINALS), _ROMAN.pattern]
+
+    @property
+    def exact_count(self):
+        return sum(self.counts[reason] for reason in self.EXACT_REASONS)
+
+    @property
+    def fuzzy_count(self):
+        return self.counts['fuzzy_title']
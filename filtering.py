@@ -2,89 +2,169 @@ import os
 import rispy
 import bibtexparser
 from collections import defaultdict
-import re
 import csv
+import argparse
+import time
+from functools import partial
+from parallel import ordered_map
+from matcher import CategoryMatcher
+from corpus_cache import CorpusCache, DEFAULT_CACHE_PATH
+from incremental import ScreeningState, classifier_signature, fingerprint, record_key
+from dedup import DuplicateIndex
+from instrumentation import DISABLED, PROFILERS, RunReport, report_path
+from columnar import ColumnarWriter
+from records import PaperRecord, as_record, csv_row, release
 
-def collect_all_papers(database_dir):
-    all_papers = []
-    original_papers = set()
-    duplicate_count = 0
+def parse_export(file_path):
+    """Parse one .ris or .bib export into a list of entry dicts."""
+    if file_path.endswith('.ris'):
+        with open(file_path, 'r', encoding='utf-8') as bibliography_file:
+            return list(rispy.load(bibliography_file))
+    with open(file_path, 'r', encoding='utf-8') as bibtex_file:
+        return bibtexparser.load(bibtex_file).entries
+
+# Entry fields used after parsing (dedup, classification, CSV output, incremental keys)
+PAPER_FIELDS = ('title', 'authors', 'year', 'journal', 'volume', 'issue', 'doi', 'abstract', 'keywords',
+                'url', 'type')
+
+# Bump when parse_export changes what it returns, so cached exports are re-parsed
+PARSER_VERSION = 1
+CORPUS_CACHE_SCHEMA = fingerprint(PARSER_VERSION, PAPER_FIELDS)
+
+def compact_entry(entry):
+    return {field: entry[field] for field in PAPER_FIELDS if field in entry}
+
+def _parse_compact(file_paths):
+    results = []
+    for file_path in file_paths:
+        parse_start = time.perf_counter()
+        entries = [compact_entry(entry) for entry in parse_export(file_path)]
+        results.append((entries, time.perf_counter() - parse_start))
+    return results
+
+def parse_exports(database_dir, cache=None, report=DISABLED, workers=1):
+    """
+    Yield (database_name, entries) for every .ris/.bib export in the
+    directory, in file name order. Exports not in the cache are parsed in up
+    to `workers` processes, which send back only the PAPER_FIELDS of each
+    entry, so a full export is never held by this process.
+    """
+    filenames = sorted(filename for filename in os.listdir(database_dir) if filename.endswith(('.ris', '.bib')))
+    file_paths = [os.path.join(database_dir, filename) for filename in filenames]
+    cached = {file_path for file_path in file_paths if cache and cache.is_fresh(file_path)}
+    parsed = ordered_map(_parse_compact, [file_path for file_path in file_paths if file_path not in cached],
+                         workers=workers, chunk_size=1)
     
-    for filename in os.listdir(database_dir):
-        file_path = os.path.join(database_dir, filename)
+    for filename, file_path in zip(filenames, file_paths):
         database_name = filename[:-4]
-        
-        if filename.endswith('.ris'):
-            with open(file_path, 'r', encoding='utf-8') as bibliography_file:
-                entries = list(rispy.load(bibliography_file))
-                for entry in entries:
-                    title = entry.get('title', '').lower()
-                    if not title:
-                        continue
-                    if title in original_papers:
-                        duplicate_count += 1
-                    else:
-                        original_papers.add(title)
-                        all_papers.append((entry, database_name))
-                        
-        elif filename.endswith('.bib'):
-            with open(file_path, 'r', encoding='utf-8') as bibtex_file:
-                bib_database = bibtexparser.load(bibtex_file)
-                for entry in bib_database.entries:
-                    title = entry.get('title', '').lower()
-                    if not title:
-                        continue
-                    if title in original_papers:
-                        duplicate_count += 1
-                    else:
-                        original_papers.add(title)
-                        all_papers.append((entry, database_name))
-    
-    return all_papers, duplicate_count, len(all_papers) + duplicate_count
+        if file_path in cached:
+            parse_start = time.perf_counter()
+            entries = [compact_entry(entry) for entry in cache.entries(file_path)]
+            parse_seconds = time.perf_counter() - parse_start
+        else:
+            [(entries, parse_seconds)] = next(parsed)
+            if cache:
+                cache.store(file_path, entries)
+        report.count('parsed', len(entries), database=database_name)
+        report.count('parse_seconds', round(parse_seconds, 4), database=database_name)
+        yield database_name, entries
+
+def iter_unique_papers(exports, dedup, report=DISABLED, totals=None):
+    """
+    Yield (entry, database_name) for every titled entry of the
+    (database_name, entries) pairs that is not a duplicate of an earlier
+    one. Entries are released as they are checked, so a caller consuming
+    the stream keeps only the papers it holds on to. `totals` (a dict)
+    collects the 'unique' and 'duplicates' counts, the 'dedup_seconds'
+    spent checking entries and the 'stream_seconds' spent producing the
+    stream (parsing and deduplication) rather than consuming it.
+    """
+    totals = totals if totals is not None else {}
+    for name in ('unique', 'duplicates', 'dedup_seconds', 'stream_seconds'):
+        totals.setdefault(name, 0)
+    resumed = time.perf_counter()
+    for database_name, entries in exports:
+        skipped = 0
+        duplicates = 0
+        dedup_seconds = 0.0
+        for entry in release(entries):
+            if not entry.get('title', ''):
+                skipped += 1
+                continue
+            check_start = time.perf_counter()
+            duplicate = dedup.is_duplicate(entry, database_name)
+            dedup_seconds += time.perf_counter() - check_start
+            if duplicate:
+                duplicates += 1
+            else:
+                totals['unique'] += 1
+                totals['stream_seconds'] += time.perf_counter() - resumed
+                yield entry, database_name
+                resumed = time.perf_counter()
+        totals['duplicates'] += duplicates
+        totals['dedup_seconds'] += dedup_seconds
+        report.count('skipped_no_title', skipped, database=database_name)
+        report.count('duplicates', duplicates, database=database_name)
+        report.count('dedup_seconds', round(dedup_seconds, 4), database=database_name)
+    totals['stream_seconds'] += time.perf_counter() - resumed
+
+def deduplicate_papers(exports, dedup=None, report=DISABLED):
+    """Drop untitled entries and duplicates from (database_name, entries) pairs."""
+    dedup = dedup if dedup is not None else DuplicateIndex()
+    totals = {}
+    all_papers = list(iter_unique_papers(exports, dedup, report, totals))
+    return all_papers, totals['duplicates'], totals['unique'] + totals['duplicates']
+
+def collect_all_papers(database_dir, cache=None, dedup=None, report=DISABLED, workers=1):
+    return deduplicate_papers(parse_exports(database_dir, cache=cache, report=report, workers=workers),
+                              dedup=dedup, report=report)
 
 def extract_paper_info(entry, database_name, category_info):
-    info = {
-        'database': database_name,
-        'title': entry.get('title', '').strip(),
-        'authors': entry.get('authors', []),
-        'year': entry.get('year', ''),
-        'journal': entry.get('journal', ''),
-        'volume': entry.get('volume', ''),
-        'issue': entry.get('issue', ''),
-        'doi': entry.get('doi', ''),
-        'abstract': entry.get('abstract', ''),
-        'keywords': entry.get('keywords', []),
-        'url': entry.get('url', ''),
-        'type': entry.get('type', ''),
-        'category': category_info['main_category'],
-        'is_dataset': category_info['is_dataset'],
-        'is_ml': category_info['is_ml']
-    }
-    return info
+    return PaperRecord(
+        database=database_name,
+        title=entry.get('title', '').strip(),
+        authors=entry.get('authors', []),
+        year=entry.get('year', ''),
+        journal=entry.get('journal', ''),
+        volume=entry.get('volume', ''),
+        issue=entry.get('issue', ''),
+        doi=entry.get('doi', ''),
+        abstract=entry.get('abstract', ''),
+        keywords=entry.get('keywords', []),
+        url=entry.get('url', ''),
+        type=entry.get('type', ''),
+        category=category_info['main_category'],
+        is_dataset=category_info['is_dataset'],
+        is_ml=category_info['is_ml']
+    )
 
-def analyze_entry(entry, database_name, patterns):
-    title = entry.get('title', '').lower()
-    abstract = entry.get('abstract', '').lower()
-    combined_text = f"{title} {abstract}"
-    
-    emotion_match_title = patterns['emotion'].search(title)
-    empathy_match_title = patterns['empathy'].search(title)
+def compile_patterns():
+    return CategoryMatcher({
+        'emotion': [r'emotion(?:s|al)?'],
+        'empathy': [r'empath(?:y|ic|i[zs]e)'],
+        'task': [r'classif(?:y|ication)', r'recogn(?:ize|ition)', r'predict(?:ion)?',
+                 r'regress(?:ion)?', r'generat(?:e|ion)'],
+        'result': [r'result', r'perform(?:ance|ed|ing)', r'f1', r'accurac(?:y|ies)', r'pearson'],
+        'dataset': [r'data(?:set|base)?'],
+        'annotation': [r'annotat(?:ion|ed|ing)'],
+        'labeling': [r'labell?(?:ing|ed|s)?']
+    }, title_categories=('emotion', 'empathy'))
+
+def analyze_entry(entry, database_name, matcher):
+    found = matcher.match(entry.get('title', ''), entry.get('abstract', ''))
     
-    if emotion_match_title and empathy_match_title:
+    if 'emotion' in found and 'empathy' in found:
         main_category = 'emotion_and_empathy'
-    elif empathy_match_title:
+    elif 'empathy' in found:
         main_category = 'empathy'
-    elif emotion_match_title:
+    elif 'emotion' in found:
         main_category = 'emotion'
     else:
         return None
 
-    is_ml = bool(patterns['task'].search(combined_text) and 
-                patterns['result'].search(combined_text))
+    is_ml = 'task' in found and 'result' in found
     
-    is_dataset = bool(patterns['dataset'].search(combined_text) and
-                     (patterns['annotation'].search(combined_text) or 
-                      patterns['labeling'].search(combined_text)))
+    is_dataset = 'dataset' in found and ('annotation' in found or 'labeling' in found)
 
     category_info = {
         'main_category': main_category,
@@ -94,53 +174,157 @@ def analyze_entry(entry, database_name, patterns):
     
     return extract_paper_info(entry, database_name, category_info)
 
-def analyze_databases(database_dir):
-    patterns = {
-        'emotion': re.compile(r'\bemotion(?:s|al)?\b', re.IGNORECASE),
-        'empathy': re.compile(r'\bempath(?:y|ic|i[zs]e)\b', re.IGNORECASE),
-        'task': re.compile(r'\b(?:classif(?:y|ication)|recogn(?:ize|ition)|predict(?:ion)?|regress(?:ion)?|generat(?:e|ion))\b', re.IGNORECASE),
-        'result': re.compile(r'\b(?:result|perform(?:ance|ed|ing)|f1|accurac(?:y|ies)|pearson)\b', re.IGNORECASE),
-        'dataset': re.compile(r'\bdata(?:set|base)?\b', re.IGNORECASE),
-        'annotation': re.compile(r'\bannotat(?:ion|ed|ing)\b', re.IGNORECASE),
-        'labeling': re.compile(r'\blabell?(?:ing|ed|s)?\b', re.IGNORECASE)
-    }
+def analyze_chunk(chunk, matcher):
+    return [analyze_entry(entry, database_name, matcher) for entry, database_name in chunk]
 
-    all_papers, total_duplicates, total_papers = collect_all_papers(database_dir)
-    
-    papers_info = []
-    database_stats = defaultdict(lambda: {
+def new_database_stats():
+    return defaultdict(lambda: {
         'emotion': {'papers': 0, 'machine_learning': 0, 'dataset': 0},
         'empathy': {'papers': 0, 'machine_learning': 0, 'dataset': 0},
         'emotion_and_empathy': {'papers': 0, 'machine_learning': 0, 'dataset': 0}
     })
+
+def count_paper(database_stats, global_stats, paper_info, step=1):
+    category = paper_info['category']
+    database_name = paper_info['database']
+    database_stats[database_name][category]['papers'] += step
+    global_stats[category]['papers'] += step
+    
+    if paper_info['is_ml']:
+        database_stats[database_name][category]['machine_learning'] += step
+        global_stats[category]['machine_learning'] += step
+        
+    if paper_info['is_dataset']:
+        database_stats[database_name][category]['dataset'] += step
+        global_stats[category]['dataset'] += step
+
+def analyze_databases(database_dir, workers=1, chunk_size=500, cache=None, state=None, dedup=None,
+                      report=DISABLED, sink=None):
+    """
+    With a ScreeningState only new or changed records are classified and the
+    stored counters are adjusted by the added/dropped results. Pass a
+    DuplicateIndex as `dedup` to inspect which records were merged and why,
+    and an enabled RunReport to time the stages and count what was skipped.
+    Relevant papers are also handed to `sink.write` (e.g. a ColumnarWriter)
+    as they are classified.
+    """
+    matcher = compile_patterns()
+    dedup = dedup if dedup is not None else DuplicateIndex()
+    # Exports are deduplicated as they are parsed and unique papers go
+    # straight to classification, so parsed entries are freed long before
+    # the last export is read; the totals are known once the stream ends
+    totals = {}
+    unique_papers = iter_unique_papers(parse_exports(database_dir, cache=cache, report=report, workers=workers),
+                                       dedup, report, totals)
+    
+    papers_info = []
+    database_stats = new_database_stats()
     
     global_stats = {
         'emotion': {'papers': 0, 'machine_learning': 0, 'dataset': 0},
         'empathy': {'papers': 0, 'machine_learning': 0, 'dataset': 0},
         'emotion_and_empathy': {'papers': 0, 'machine_learning': 0, 'dataset': 0},
-        'total_papers': total_papers,
-        'original_papers': len(all_papers),
-        'duplicates': total_duplicates
+        'total_papers': 0,
+        'original_papers': 0,
+        'duplicates': 0,
+        'exact_duplicates': 0,
+        'fuzzy_duplicates': 0
     }
 
-    for entry, database_name in all_papers:
-        paper_info = analyze_entry(entry, database_name, patterns)
-        if paper_info:
-            papers_info.append(paper_info)
-            
-            category = paper_info['category']
-            database_stats[database_name][category]['papers'] += 1
-            global_stats[category]['papers'] += 1
-            
-            if paper_info['is_ml']:
-                database_stats[database_name][category]['machine_learning'] += 1
-                global_stats[category]['machine_learning'] += 1
-                
-            if paper_info['is_dataset']:
-                database_stats[database_name][category]['dataset'] += 1
-                global_stats[category]['dataset'] += 1
-
-    return dict(database_stats), global_stats, papers_info
+    if state is None:
+        with report.stage('categorize', profile=True) as stage:
+            start = time.perf_counter()
+            # Shards come back in input order, so counters and papers_info match a serial run
+            shard_results = ordered_map(partial(analyze_chunk, matcher=matcher), unique_papers,
+                                        workers=workers, chunk_size=chunk_size)
+            for shard in shard_results:
+                for paper_info in shard:
+                    if paper_info:
+                        papers_info.append(paper_info)
+                        count_paper(database_stats, global_stats, paper_info)
+                        if sink:
+                            sink.write(paper_info)
+            stage['classify_seconds'] = classify_seconds(start, totals)
+        count_totals(report, global_stats, totals, dedup)
+        count_relevant(report, papers_info, categorized=totals['unique'])
+        return dict(database_stats), global_stats, papers_info
+
+    stored_database_stats = state.get_counters('database_stats')
+    stored_global_stats = state.get_counters('global_stats')
+    if stored_database_stats is None or stored_global_stats is None:
+        state.reset()
+    else:
+        database_stats.update(stored_database_stats)
+        for category in ['emotion', 'empathy', 'emotion_and_empathy']:
+            global_stats[category] = stored_global_stats[category]
+
+    classifier = classifier_signature(matcher, analyze_entry, extract_paper_info)
+    records = ((record_key(entry), fingerprint(classifier, database_name, entry), (entry, database_name))
+               for entry, database_name in unique_papers)
+    with report.stage('categorize', profile=True) as stage:
+        start = time.perf_counter()
+        for paper_info in state.screen(records, lambda record: analyze_entry(*record, matcher)):
+            if paper_info:
+                paper_info = as_record(PaperRecord, paper_info)
+                papers_info.append(paper_info)
+                if sink:
+                    sink.write(paper_info)
+        stage['classify_seconds'] = classify_seconds(start, totals)
+    count_totals(report, global_stats, totals, dedup)
+    count_relevant(report, papers_info, categorized=state.classified)
+    for paper_info in state.dropped:
+        count_paper(database_stats, global_stats, paper_info, step=-1)
+    for paper_info in state.added:
+        count_paper(database_stats, global_stats, paper_info)
+
+    # List databases as a full run does: in order of their first relevant paper, none without one
+    database_stats = {db: database_stats[db] for db in dict.fromkeys(paper_info['database']
+                                                                     for paper_info in papers_info)}
+    state.set_counters('database_stats', database_stats)
+    state.set_counters('global_stats', global_stats)
+    return database_stats, global_stats, papers_info
+
+def classify_seconds(start, totals):
+    """
+    Time since `start` not spent producing the iter_unique_papers stream:
+    entries are parsed and deduplicated as the classification loop pulls
+    them, so the loop's own stage time includes both.
+    """
+    return round(time.perf_counter() - start - totals['stream_seconds'], 4)
+
+def count_totals(report, global_stats, totals, dedup):
+    """Fill in the paper and duplicate totals once every export has been read."""
+    global_stats.update({
+        'total_papers': totals['unique'] + totals['duplicates'],
+        'original_papers': totals['unique'],
+        'duplicates': totals['duplicates'],
+        'exact_duplicates': dedup.exact_count,
+        'fuzzy_duplicates': dedup.fuzzy_count
+    })
+    report.count('parsed', sum(counts['parsed'] for counts in report.databases.values()))
+    report.count('skipped_no_title', sum(counts['skipped_no_title'] for counts in report.databases.values()))
+    report.count('duplicates', totals['duplicates'])
+    report.count('exact_duplicates', dedup.exact_count)
+    report.count('fuzzy_duplicates', dedup.fuzzy_count)
+    report.count('unique_papers', totals['unique'])
+    report.count('parse_seconds', round(sum(counts['parse_seconds'] for counts in report.databases.values()), 4))
+    report.count('dedup_seconds', round(totals['dedup_seconds'], 4))
+
+def count_relevant(report, papers_info, categorized):
+    if not report.enabled:
+        return
+    report.count('categorized', categorized)
+    report.count('relevant', len(papers_info))
+    for paper_info in papers_info:
+        report.count(paper_info['category'], database=paper_info['database'])
+
+# Column types of the optional Parquet/Feather output of the screened papers
+COLUMNAR_COLUMNS = [
+    ('database', 'string'), ('title', 'string'), ('authors', 'list'), ('year', 'string'),
+    ('journal', 'string'), ('volume', 'string'), ('issue', 'string'), ('doi', 'string'),
+    ('abstract', 'string'), ('keywords', 'list'), ('url', 'string'), ('type', 'string'),
+    ('category', 'string'), ('is_dataset', 'bool'), ('is_ml', 'bool')
+]
 
 def save_paper_info_to_csv(papers_info, output_file):
     with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
@@ -149,15 +333,26 @@ def save_paper_info_to_csv(papers_info, output_file):
             'volume', 'issue', 'doi', 'abstract', 'keywords', 'url', 'type',
             'category', 'is_dataset', 'is_ml'
         ]
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        for paper in papers_info:
+            writer.writerow(csv_row(paper, fieldnames))
+
+def save_duplicates_to_csv(duplicates, output_file):
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        fieldnames = ['database', 'title', 'kept_database', 'kept_title', 'reason']
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
-        for paper in papers_info:
-            paper['authors'] = '; '.join(paper['authors']) if isinstance(paper['authors'], list) else paper['authors']
-            paper['keywords'] = '; '.join(paper['keywords']) if isinstance(paper['keywords'], list) else paper['keywords']
+        writer.writerows(duplicates)
 
-            paper['is_dataset'] = 'Yes' if paper['is_dataset'] else 'No'
-            paper['is_ml'] = 'Yes' if paper['is_ml'] else 'No'
-            writer.writerow(paper)
+# Header lines of the statistics file that only the raw exports can produce
+OVERALL_TOTALS = {
+    'total_papers': 'Total papers across all databases',
+    'original_papers': 'Total unique papers',
+    'duplicates': 'Total duplicates removed',
+    'exact_duplicates': '  - Exact duplicates (title, DOI or normalized title)',
+    'fuzzy_duplicates': '  - Fuzzy title duplicates'
+}
 
 def print_and_save_stats(database_stats, global_stats, output_file):
     with open(output_file, 'w', encoding='utf-8') as f:
@@ -166,9 +361,9 @@ def print_and_save_stats(database_stats, global_stats, output_file):
             f.write(line + '\n')
 
         write_line("Overall Statistics:")
-        write_line(f"Total papers across all databases: {global_stats['total_papers']}")
-        write_line(f"Total unique papers: {global_stats['original_papers']}")
-        write_line(f"Total duplicates removed: {global_stats['duplicates']}")
+        for key, label in OVERALL_TOTALS.items():
+            if key in global_stats:  # Unknown when regenerated from the screened papers alone
+                write_line(f"{label}: {global_stats[key]}")
         
         for category in ['emotion', 'empathy', 'emotion_and_empathy']:
             write_line(f"\nTotal {category} related papers: {global_stats[category]['papers']}")
@@ -184,17 +379,67 @@ def print_and_save_stats(database_stats, global_stats, output_file):
                 write_line(f"  - Machine Learning papers: {stats[category]['machine_learning']}")
 
 def main():
+    parser = argparse.ArgumentParser(description='Screen database exports for emotion/empathy papers.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of parsing and classification processes')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Entries per worker task')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Parsed-corpus cache file')
+    parser.add_argument('--cache-max-mb', type=int, default=2048, help='Cache size cap in MB')
+    parser.add_argument('--no-cache', action='store_true', help='Always re-parse every export')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only classify records that are new or changed since the last run')
+    parser.add_argument('--state', default='screening_state.sqlite', help='Incremental screening state file')
+    parser.add_argument('--report', action='store_true',
+                        help='Write stage timings and counters to a JSON report next to the statistics file')
+    parser.add_argument('--profile', choices=PROFILERS, help='Profile the hot loops (implies --report)')
+    parser.add_argument('--columnar', metavar='PATH',
+                        help='Also write the screened papers to a .parquet or .feather file')
+    args = parser.parse_args()
+
     database_dir = '/Volumes/ssd/01-ckj-postdoc/emopathy-dataset-review/boolean-search/all-zot-items'
     
-    database_stats, global_stats, papers_info = analyze_databases(database_dir)
+    cache = None if args.no_cache else CorpusCache(args.cache, max_bytes=args.cache_max_mb * 1024 ** 2,
+                                                        schema=CORPUS_CACHE_SCHEMA)
+    state = ScreeningState(args.state) if args.incremental else None
+    dedup = DuplicateIndex()
+    report = RunReport('filtering', profiler=args.profile) if args.report or args.profile else DISABLED
+    report.set(workers=args.workers, chunk_size=args.chunk_size, cache=cache is not None,
+               incremental=args.incremental)
+    sink = ColumnarWriter(args.columnar, COLUMNAR_COLUMNS) if args.columnar else None
+    try:
+        database_stats, global_stats, papers_info = analyze_databases(
+            database_dir, workers=args.workers, chunk_size=args.chunk_size, cache=cache, state=state,
+            dedup=dedup, report=report, sink=sink)
+        if state:
+            print(f"Classified {state.classified} new or changed records")
+    except BaseException:
+        if sink:
+            sink.abort()
+        raise
+    else:
+        if sink:
+            sink.close()
+            print(f"Columnar paper information saved to {args.columnar}")
+    finally:
+        if cache:
+            cache.close()
+        if state:
+            state.close()
     
     paper_info_file = 'final_automatically_screened_papers.csv'
-    save_paper_info_to_csv(papers_info, paper_info_file)
+    with report.stage('write_csv'):
+        save_paper_info_to_csv(papers_info, paper_info_file)
     print(f"Detailed paper information saved to {paper_info_file}")
+
+    duplicates_file = 'final_duplicate_papers.csv'
+    save_duplicates_to_csv(dedup.duplicates, duplicates_file)
+    print(f"Duplicate records and their surviving copies saved to {duplicates_file}")
     
     stats_output_file = 'final_analysis_statistics.txt'
     print_and_save_stats(database_stats, global_stats, stats_output_file)
     print(f"Statistics saved to {stats_output_file}")
 
+    if report.write(report_path(stats_output_file)):
+        print(f"Run report saved to {report_path(stats_output_file)}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,144 @@
+import hashlib
+import inspect
+import json
+import re
+import sqlite3
+
+def record_key(entry):
+    """Identify a record by DOI, falling back to normalized title + year."""
+    doi = entry.get('doi', '').strip().lower()
+    if doi:
+        return f"doi:{doi}"
+    title = re.sub(r'\W+', ' ', entry.get('title', '').lower()).strip()
+    return f"title:{title}|{entry.get('year', '')}"
+
+def fingerprint(*parts):
+    """Content hash of everything a record's screening result depends on."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def classifier_signature(matcher, *functions):
+    """
+    Fingerprint of a classifier: the matcher's term lists and the source of
+    the functions that turn its hits into results. Record fingerprints
+    include it, so editing the patterns or the rules reclassifies every
+    record instead of reusing results computed under the old ones.
+    """
+    return fingerprint(matcher.signature, [inspect.getsource(function) for function in functions])
+
+class ScreeningState:
+    """
+    SQLite record of the previous screening run: one row per record with its
+    fingerprint and screening result (NULL when it was not relevant), plus
+    named JSON counters. screen() reuses stored results for unchanged records
+    and classifies only new or modified ones; the results that were added and
+    dropped are collected so callers can adjust their counters instead of
+    recounting everything.
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS records (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                result TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        ''')
+        self.added = []
+        self.dropped = []
+        self.classified = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_counters(self, name):
+        row = self.conn.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_counters(self, name, value):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (name, json.dumps(value)))
+
+    def reset(self):
+        with self.conn:
+            self.conn.execute('DELETE FROM records')
+            self.conn.execute('DELETE FROM meta')
+
+    def _screen_batch(self, batch, classify):
+        keys = [key for key, _, _ in batch]
+        stored = {}
+        for start in range(0, len(keys), 900):  # Stay under SQLite's bound-parameter limit
+            part = keys[start:start + 900]
+            stored.update((key, (fp, result)) for key, fp, result in self.conn.execute(
+                f"SELECT key, fingerprint, result FROM records WHERE key IN ({','.join('?' * len(part))})",
+                part))
+
+        results = []
+        updates = []
+        for key, record_fingerprint, payload in batch:
+            old_fingerprint, old_result = stored.get(key, (None, None))
+            if old_fingerprint == record_fingerprint:
+                results.append(json.loads(old_result) if old_result else None)
+                continue
+            if old_result:
+                self.dropped.append(json.loads(old_result))
+            result = classify(payload)
+            self.classified += 1
+            if result:
+                self.added.append(result)
+            results.append(result)
+            # default=dict stores record objects (see records.py) like the dicts they replace
+            updates.append((key, record_fingerprint, json.dumps(result, default=dict) if result else None))
+        if updates:
+            with self.conn:
+                self.conn.executemany('INSERT OR REPLACE INTO records VALUES (?, ?, ?)', updates)
+        return results
+
+    def screen(self, records, classify):
+        """
+        Yield the screening result of every (key, fingerprint, payload) record
+        in input order. Repeated keys within one run are disambiguated by
+        position, and stored records missing from this run are dropped.
+        Stored counters are cleared on start, so read them first and save the
+        updated ones once the generator is exhausted; an interrupted run then
+        leaves no counters behind and the caller knows to start over.
+        """
+        self.added, self.dropped, self.classified = [], [], 0
+        with self.conn:
+            self.conn.execute('DELETE FROM meta')
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)')
+        self.conn.execute('DELETE FROM seen')
+        key_counts = {}
+        batch = []
+        for key, record_fingerprint, payload in records:
+            count = key_counts.get(key, 0)
+            key_counts[key] = count + 1
+            if count:
+                key = f"{key}#{count}"
+            batch.append((key, record_fingerprint, payload))
+            if len(batch) == self.batch_size:
+                self.conn.executemany('INSERT INTO seen VALUES (?)', ((k,) for k, _, _ in batch))
+                yield from self._screen_batch(batch, classify)
+                batch = []
+        if batch:
+            self.conn.executemany('INSERT INTO seen VALUES (?)', ((k,) for k, _, _ in batch))
+            yield from self._screen_batch(batch, classify)
+
+        removed = self.conn.execute(
+            'SELECT result FROM records WHERE key NOT IN (SELECT key FROM seen)').fetchall()
+        self.dropped.extend(json.loads(result) for (result,) in removed if result)
+        with self.conn:
+            self.conn.execute('DELETE FROM records WHERE key NOT IN (SELECT key FROM seen)')
@@ -0,0 +1,173 @@
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILERS = ('cprofile', 'sample')
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024, 1)  # bytes on macOS, KiB elsewhere
+
+def report_path(stats_file):
+    """`final_analysis_statistics.txt` -> `final_analysis_statistics_run_report.json`"""
+    return os.path.splitext(stats_file)[0] + '_run_report.json'
+
+class StackSampler:
+    """
+    Record the innermost frames of one thread every `interval` seconds from a
+    background thread. Cheaper than cProfile on long loops, and it shows
+    where the time goes rather than how often each function is called.
+    """
+
+    def __init__(self, interval=0.005, depth=3):
+        self.interval = interval
+        self.depth = depth
+        self.samples = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                stack = traceback.extract_stack(frame, limit=self.depth)
+                self.samples[' <- '.join(f"{os.path.basename(f.filename)}:{f.lineno} {f.name}"
+                                         for f in reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def top(self, count=20):
+        return [{'stack': stack, 'samples': samples} for stack, samples in self.samples.most_common(count)]
+
+class RunReport:
+    """
+    Stage timings, counters and peak memory of one screening run, saved as
+    JSON next to the statistics file.
+
+    A disabled report (the default everywhere) turns stage() into a shared
+    nullcontext and count() into an immediate return, so instrumented code
+    pays a function call per stage or counter update and nothing more. The
+    scripts count in bulk after their loops rather than per entry.
+
+    With `profiler` set to 'cprofile' or 'sample', stages opened with
+    profile=True (the hot loops) are profiled; cProfile stats are dumped to
+    `<profile_dir>/<stage>.prof` and the sampler's top stacks go into the
+    report.
+    """
+
+    def __init__(self, name, enabled=True, profiler=None, profile_dir='.'):
+        if profiler not in (None,) + PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r}; expected one of {PROFILERS}")
+        self.name = name
+        self.enabled = enabled
+        self.profiler = profiler if enabled else None
+        self.profile_dir = profile_dir
+        self.started = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.stages = []
+        self.counters = Counter()
+        self.databases = defaultdict(Counter)
+        self.settings = {}
+        self.profiles = {}
+
+    @contextmanager
+    def _timed_stage(self, name, profile):
+        record = {'stage': name}
+        profiler = None
+        if profile and self.profiler == 'cprofile':
+            profiler = cProfile.Profile()
+        elif profile and self.profiler == 'sample':
+            profiler = StackSampler()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            if isinstance(profiler, cProfile.Profile):
+                profiler.enable()
+            elif profiler:
+                profiler.__enter__()
+            yield record
+        finally:
+            if isinstance(profiler, cProfile.Profile):
+                profiler.disable()
+            elif profiler:
+                profiler.__exit__(None, None, None)
+            record['seconds'] = round(time.perf_counter() - start_wall, 4)
+            record['cpu_seconds'] = round(time.process_time() - start_cpu, 4)
+            record['peak_rss_mb'] = peak_rss_mb()
+            self.stages.append(record)
+            if isinstance(profiler, cProfile.Profile):
+                os.makedirs(self.profile_dir, exist_ok=True)
+                path = os.path.join(self.profile_dir, f"{self.name}-{name}.prof")
+                pstats.Stats(profiler).dump_stats(path)
+                self.profiles[name] = path
+            elif profiler:
+                self.profiles[name] = profiler.top()
+
+    def stage(self, name, profile=False):
+        """
+        Context manager timing one stage (wall and CPU time, peak RSS after).
+        Extra fields can be set on the yielded dict, e.g. item counts.
+        """
+        if not self.enabled:
+            return nullcontext({})
+        return self._timed_stage(name, profile)
+
+    def count(self, name, value=1, database=None):
+        if not self.enabled:
+            return
+        if database is None:
+            self.counters[name] += value
+        else:
+            self.databases[database][name] += value
+
+    def set(self, **settings):
+        if self.enabled:
+            self.settings.update(settings)
+
+    def to_dict(self):
+        return {
+            'run': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'seconds': round(time.perf_counter() - self._start, 4),
+            'peak_rss_mb': peak_rss_mb(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': self.settings,
+            'stages': self.stages,
+            'counters': dict(self.counters),
+            'databases': {database: dict(counts) for database, counts in self.databases.items()},
+            'profiles': self.profiles,
+        }
+
+    def write(self, path):
+        """Write the report as JSON; does nothing for a disabled report."""
+        if not self.enabled:
+            return None
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
+
+DISABLED = RunReport('disabled', enabled=False)
@@ -0,0 +1,210 @@
+import json
+import re
+import sqlite3
+
+from eldar import Query
+from eldar.entry import Entry
+from eldar.operators import AND, ANDNOT, OR
+from eldar.regex import WORD_REGEX
+from unidecode import unidecode
+
+from incremental import fingerprint
+
+DEFAULT_INDEX_PATH = 'boolean_index.sqlite'
+_WORD = re.compile(WORD_REGEX)
+
+def tokenize(text):
+    """Lowercase, strip accents and split into the word tokens eldar matches on."""
+    text = text.lower()
+    if not text.isascii():
+        text = unidecode(text)
+    return set(_WORD.findall(text))
+
+class InvertedIndex:
+    """
+    Persistent token -> record postings for eldar-style boolean queries.
+
+    Each record is indexed under the tokens of its `text_fields` joined by a
+    space, exactly as eldar's Query tokenizes "title abstract", and under
+    `field:token` for every field in `prefixed_fields`, so `title:emot*`
+    restricts a term to titles. Terms ending in `*` (or holding one) are
+    answered from a range scan over the sorted token table, and AND / OR /
+    AND NOT become set intersection, union and difference of record IDs.
+
+    update() stores each record's fingerprint and skips unchanged records, so
+    re-running it on a grown export only tokenizes the new or edited ones.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, text_fields=('title', 'abstract'),
+                 prefixed_fields=('title',), batch_size=1000):
+        self.path = path
+        self.text_fields = tuple(text_fields)
+        self.prefixed_fields = tuple(prefixed_fields)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                fingerprint TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                token TEXT NOT NULL,
+                doc_id INTEGER NOT NULL,
+                PRIMARY KEY (token, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+        ''')
+        self._keys = None
+        self.indexed = 0
+        self.removed = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+    def record_tokens(self, entry):
+        tokens = tokenize(' '.join(str(entry.get(field, '')) for field in self.text_fields))
+        for field in self.prefixed_fields:
+            tokens.update(f"{field}:{token}" for token in tokenize(str(entry.get(field, ''))))
+        return tokens
+
+    def _update_batch(self, batch):
+        keys = [key for key, _, _ in batch]
+        stored = {}
+        for start in range(0, len(keys), 900):  # Stay under SQLite's bound-parameter limit
+            part = keys[start:start + 900]
+            stored.update((key, (doc_id, fp)) for doc_id, key, fp in self.conn.execute(
+                f"SELECT doc_id, key, fingerprint FROM docs WHERE key IN ({','.join('?' * len(part))})",
+                part))
+
+        with self.conn:
+            for key, position, entry in batch:
+                entry_fingerprint = fingerprint(entry)
+                doc_id, old_fingerprint = stored.get(key, (None, None))
+                if old_fingerprint == entry_fingerprint:
+                    self.conn.execute('UPDATE docs SET position = ? WHERE doc_id = ?', (position, doc_id))
+                    continue
+                data = json.dumps(entry, ensure_ascii=False, default=str)
+                if doc_id is None:
+                    doc_id = self.conn.execute(
+                        'INSERT INTO docs (key, fingerprint, position, data) VALUES (?, ?, ?, ?)',
+                        (key, entry_fingerprint, position, data)).lastrowid
+                else:
+                    self.conn.execute('DELETE FROM postings WHERE doc_id = ?', (doc_id,))
+                    self.conn.execute('UPDATE docs SET fingerprint = ?, position = ?, data = ? WHERE doc_id = ?',
+                                      (entry_fingerprint, position, data, doc_id))
+                self.conn.executemany('INSERT INTO postings VALUES (?, ?)',
+                                      ((token, doc_id) for token in self.record_tokens(entry)))
+                self.indexed += 1
+
+    def update(self, records, prune=False):
+        """
+        Index (key, entry) records, re-tokenizing only new or changed ones.
+        Repeated keys are disambiguated by position as in ScreeningState. With
+        `prune` the records are the complete corpus and indexed records
+        missing from it are removed; without it they are kept, so exports can
+        be added one file at a time.
+        """
+        self.indexed, self.removed = 0, 0
+        self._keys = None
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)')
+        self.conn.execute('DELETE FROM seen')
+        # Records keep corpus order; added ones go after everything indexed
+        first_position = 0 if prune else self.conn.execute(
+            'SELECT COALESCE(MAX(position) + 1, 0) FROM docs').fetchone()[0]
+        key_counts = {}
+        batch = []
+        for position, (key, entry) in enumerate(records, start=first_position):
+            count = key_counts.get(key, 0)
+            key_counts[key] = count + 1
+            if count:
+                key = f"{key}#{count}"
+            batch.append((key, position, entry))
+            if len(batch) == self.batch_size:
+                self.conn.executemany('INSERT INTO seen VALUES (?)', ((k,) for k, _, _ in batch))
+                self._update_batch(batch)
+                batch = []
+        if batch:
+            self.conn.executemany('INSERT INTO seen VALUES (?)', ((k,) for k, _, _ in batch))
+            self._update_batch(batch)
+
+        if prune:
+            with self.conn:
+                self.conn.execute('DELETE FROM postings WHERE doc_id IN '
+                                  '(SELECT doc_id FROM docs WHERE key NOT IN (SELECT key FROM seen))')
+                self.removed = self.conn.execute(
+                    'DELETE FROM docs WHERE key NOT IN (SELECT key FROM seen)').rowcount
+
+    def _term_docs(self, entry):
+        if ' ' in entry.query:
+            raise ValueError(f"Phrase queries are not supported: {entry.query!r}")
+        if entry.rgx is None:
+            rows = self.conn.execute('SELECT doc_id FROM postings WHERE token = ?', (entry.query,))
+            return {doc_id for (doc_id,) in rows}
+        prefix = entry.query.split('*', 1)[0]
+        if not prefix:
+            raise ValueError(f"Wildcard terms need a literal prefix: {entry.query!r}")
+        token_range = 'token >= ? AND token < ?'
+        if ':' not in prefix:
+            token_range += " AND instr(token, ':') = 0"  # "t*" must not reach "title:..." tokens
+        bounds = (prefix, prefix + '\U0010ffff')
+        if entry.query == prefix + '*':
+            rows = self.conn.execute(f"SELECT DISTINCT doc_id FROM postings WHERE {token_range}", bounds)
+            return {doc_id for (doc_id,) in rows}
+        # Inner wildcards: the prefix narrows the scan, eldar's regex decides
+        tokens = [token for (token,) in self.conn.execute(
+            f"SELECT DISTINCT token FROM postings WHERE {token_range}", bounds)
+                  if entry.rgx.match(token)]
+        docs = set()
+        for token in tokens:
+            docs.update(doc_id for (doc_id,) in self.conn.execute(
+                'SELECT doc_id FROM postings WHERE token = ?', (token,)))
+        return docs
+
+    def _evaluate(self, node):
+        if isinstance(node, Entry):
+            docs = self._term_docs(node)
+            return self._doc_keys().keys() - docs if node.not_ else docs
+        left = self._evaluate(node.left)
+        right = self._evaluate(node.right)
+        if isinstance(node, AND):
+            return left & right
+        if isinstance(node, ANDNOT):
+            return left - right
+        if isinstance(node, OR):
+            return left | right
+        raise TypeError(f"Unsupported query node: {node!r}")
+
+    def _doc_keys(self):
+        if self._keys is None:
+            self._keys = dict(self.conn.execute('SELECT doc_id, key FROM docs'))
+        return self._keys
+
+    def search(self, query):
+        """Return the set of record keys matching an eldar boolean query."""
+        keys = self._doc_keys()
+        return {keys[doc_id] for doc_id in self._evaluate(Query(query).query)}
+
+    def entries(self, keys=None):
+        """Return the stored entries for `keys` (default: all) in corpus order."""
+        if keys is None:
+            rows = self.conn.execute('SELECT position, data FROM docs').fetchall()
+        else:
+            keys = list(keys)
+            rows = []
+            for start in range(0, len(keys), 900):
+                part = keys[start:start + 900]
+                rows.extend(self.conn.execute(
+                    f"SELECT position, data FROM docs WHERE key IN ({','.join('?' * len(part))})", part))
+        return [json.loads(data) for _, data in sorted(rows)]
@@ -0,0 +1,69 @@
+import re
+
+class CategoryMatcher:
+    """
+    Match many keyword categories against a paper in a single scan.
+
+    `categories` maps a category name to a list of term regexes. Every term
+    must start with a literal letter; terms are wrapped in word boundaries and
+    matched case-insensitively. Categories listed in `title_categories` are
+    matched against the title only, all others against "title abstract".
+    With `title_gate` set the abstract is never scanned unless a title
+    category fired, which is how both screening scripts decide relevance.
+    """
+
+    def __init__(self, categories, title_categories=(), title_gate=True):
+        self.categories = {name: list(terms) for name, terms in categories.items()}
+        self.title_categories = frozenset(title_categories)
+        self.text_categories = frozenset(self.categories) - self.title_categories
+        self.title_gate = title_gate
+        self._compiled = {}
+
+    @property
+    def signature(self):
+        """The term lists and matching rules categories depend on, for callers that cache results."""
+        return [self.categories, sorted(self.title_categories), self.title_gate]
+
+    def _pattern(self, names):
+        """Return (and cache) one alternation with a named group per category."""
+        pattern = self._compiled.get(names)
+        if pattern is None:
+            first_chars = set()
+            groups = []
+            for name in sorted(names):
+                terms = self.categories[name]
+                first_chars.update(c for term in terms for c in (term[0].lower(), term[0].upper()))
+                groups.append(f"(?P<{name}>{'|'.join(terms)})")
+            # The leading character class lets the engine skip ahead quickly
+            charset = ''.join(sorted(first_chars))
+            pattern = re.compile(rf"\b(?=[{charset}])(?:{'|'.join(groups)})\b", re.IGNORECASE)
+            self._compiled[names] = pattern
+        return pattern
+
+    def _scan(self, text, names):
+        """
+        Find which of `names` occur in `text`. Each search returns the leftmost
+        hit of any remaining category; that category is dropped and the search
+        resumes from the same position, so overlapping hits of different
+        categories are still found and the text is walked about once.
+        """
+        found = set()
+        remaining = frozenset(names)
+        pos = 0
+        while remaining:
+            match = self._pattern(remaining).search(text, pos)
+            if not match:
+                break
+            found.add(match.lastgroup)
+            remaining = remaining - {match.lastgroup}
+            pos = match.start()
+        return found
+
+    def match(self, title, abstract=''):
+        """Return the set of categories that fired for a paper."""
+        found = self._scan(title, self.title_categories) if self.title_categories else set()
+        if self.title_gate and self.title_categories and not found:
+            return found
+        if self.text_categories:
+            found |= self._scan(f"{title} {abstract}", self.text_categories)
+        return found
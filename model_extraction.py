@@ -0,0 +1,112 @@
+import re
+
+# (canonical name, pattern); a canonical name of None keeps the matched
+# variant, upper-cased, e.g. "GPT-2"
+MODEL_PATTERNS = [
+    ('LSTM', r'LSTMs?'), ('CNN', r'CNNs?'), ('Transformer', r'Transformers?'), ('BERT', r'BERTs?'),
+    ('GRU', r'GRUs?'), ('RNN', r'RNNs?'), ('XLNet', r'XLNets?'), ('RoBERTa', r'RoBERTas?'),
+    (None, r'GPT(?:-\d+)?'), ('SVM', r'SVMs?'), ('Random Forest', r'Random\s+Forests?'),
+    ('XGBoost', r'XGBoost'), ('LightGBM', r'LightGBM'), ('CatBoost', r'CatBoost'), ('KNN', r'KNN'),
+    ('Naive Bayes', r'Naive\s+Bayes'), ('Decision Tree', r'Decision\s+Trees?'),
+    ('Linear Regression', r'Linear\s+Regression'), ('Logistic Regression', r'Logistic\s+Regression'),
+    ('Ensemble', r'Ensembles?'),
+]
+METRIC_NAMES = ['accuracy', 'f1 score', 'precision', 'recall', 'auc', 'bleu', 'rouge', 'mse', 'rmse']
+
+# Numbered headings such as "1. Methods" or "4. Results and Discussion"
+HEADING_START = r'[0-9]+\.\s+[A-Za-z]+'
+HEADING_PATTERN = HEADING_START + r'.*'
+
+class ModelMetricExtractor:
+    """
+    Find section headings, model mentions and "metric: value" pairs in one
+    left-to-right scan of a document. All patterns are compiled once, so a
+    single instance should be reused across documents.
+
+    Whitespace between a metric and its value never runs into the next
+    heading, so a hit never spans two sections. A heading is read through
+    a lookahead, so models and metrics on the heading line itself (e.g. a
+    numbered list item "2. RoBERTa reaches accuracy: 0.93") are still found
+    and belong to the section that line opens.
+    """
+
+    def __init__(self, model_patterns=MODEL_PATTERNS, metric_names=METRIC_NAMES):
+        self._model_patterns = [(canonical, re.compile(pattern, re.IGNORECASE))
+                                for canonical, pattern in model_patterns]
+        self._canonical = {}
+        models = '|'.join(pattern for _, pattern in model_patterns)
+        metrics = '|'.join(re.escape(name).replace(r'\ ', ' ') for name in metric_names)
+        gap = rf'(?:(?!\n{HEADING_START})\s)*'
+        # A hit can only start at a newline or at the first letter of a model
+        # or metric; the leading class lets the engine skip everything else
+        first_chars = {'\n'} | {c for name in [p for _, p in model_patterns] + list(metric_names)
+                                 for c in (name[0].lower(), name[0].upper())}
+        charset = ''.join(sorted(re.escape(c) for c in first_chars))
+        self.pattern = re.compile(
+            rf'(?=[{charset}])(?:'
+            rf'\n(?=(?P<heading>{HEADING_PATTERN}))'
+            rf'|\b(?P<model>{models})\b'
+            rf'|(?P<metric>{metrics}){gap}[:=]?{gap}(?P<value>\d+\.?\d*))',
+            re.IGNORECASE)
+        self._leading_heading = re.compile(HEADING_PATTERN)
+
+    def canonical_model(self, mention):
+        """Map a matched mention ("SVMs", "random  forest") to its canonical name."""
+        canonical = self._canonical.get(mention)
+        if canonical is None:
+            for name, pattern in self._model_patterns:
+                if pattern.fullmatch(mention):
+                    canonical = name or mention.upper()
+                    break
+            self._canonical[mention] = canonical
+        return canonical
+
+    def iter_hits(self, text):
+        """
+        Yield one record per hit: {'section', 'model'} for model mentions and
+        {'section', 'metric', 'value'} for metrics. Text before the first
+        heading belongs to "No Heading" (or "Entire Text" when the document
+        has no headings at all).
+        """
+        section = None
+        preamble = []
+        leading = self._leading_heading.match(text)
+        if leading:
+            section = leading.group(0).strip()
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == 'heading':
+                section = match.group('heading').strip()
+                continue
+            if kind == 'value':
+                record = {'metric': match.group('metric').lower().replace(' ', '_'),
+                          'value': float(match.group('value'))}
+            else:
+                record = {'model': self.canonical_model(match.group('model'))}
+            if section is None:
+                preamble.append(record)
+                continue
+            if preamble:
+                yield from ({'section': 'No Heading', **hit} for hit in preamble)
+                preamble = []
+            yield {'section': section, **record}
+        yield from ({'section': 'No Heading' if section else 'Entire Text', **hit} for hit in preamble)
+
+    def extract(self, text):
+        return list(self.iter_hits(text))
+
+_HEADING_LINE = re.compile('^' + HEADING_PATTERN, re.MULTILINE)
+
+def split_sections(text):
+    """
+    Split a document at the headings iter_hits recognizes and return
+    (section, text) pairs whose texts join back to the whole document.
+    Sections are named as iter_hits names them.
+    """
+    starts = [(match.group(0).strip(), match.start()) for match in _HEADING_LINE.finditer(text)]
+    if not starts:
+        return [('Entire Text', text)] if text else []
+    sections = [('No Heading', text[:starts[0][1]])] if starts[0][1] else []
+    for (section, start), (_, end) in zip(starts, starts[1:] + [(None, len(text))]):
+        sections.append((section, text[start:end]))
+    return sections
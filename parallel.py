@@ -0,0 +1,34 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+def iter_chunks(items, chunk_size):
+    """Group any iterable into lists of at most `chunk_size` items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def ordered_map(func, items, workers=1, chunk_size=1000):
+    """
+    Apply `func` to chunks of `items` across a process pool and yield the
+    per-chunk results in input order. Only a few chunks per worker are in
+    flight at once so streamed input is never fully materialized.
+    With workers <= 1 everything runs in the current process.
+    """
+    chunks = iter_chunks(items, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
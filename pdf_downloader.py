@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+MANIFEST_NAME = 'manifest.jsonl'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+PDF_LINK_PATTERN = re.compile(r'<a\b[^>]*\bhref="([^"]+)"[^>]*>\s*(?:<[^>]+>\s*)*PDF\b', re.IGNORECASE)
+
+class HostRateLimiter:
+    """Space out request starts to each host by at least `min_interval` seconds."""
+
+    def __init__(self, min_interval=0.2):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class Manifest:
+    """Append-only JSON-lines log of download outcomes; the last line per URL wins."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.records = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.records[record['url']] = record
+
+    def completed(self, url, download_dir):
+        record = self.records.get(url)
+        return (record is not None and record['status'] == 'ok'
+                and os.path.exists(os.path.join(download_dir, record['path'])))
+
+    def add(self, record):
+        with self._lock:
+            self.records[record['url']] = record
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+
+class PDFDownloader:
+    """
+    Download paper PDFs concurrently with per-host rate limits and retries.
+
+    Files are stored under their SHA-256 (`ab/abcdef....pdf`) so the same PDF
+    reached from two URLs is kept once, and every outcome is appended to a
+    manifest in `download_dir` so reruns skip what is already on disk.
+    """
+
+    def __init__(self, download_dir, workers=8, min_interval=0.2, retries=4,
+                 backoff=1.0, timeout=60):
+        self.download_dir = download_dir
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(min_interval)
+        self.manifest = Manifest(os.path.join(download_dir, MANIFEST_NAME))
+        self._local = threading.local()
+        self._sessions = []
+        os.makedirs(download_dir, exist_ok=True)
+
+    @property
+    def session(self):
+        """One pooled session per worker thread; requests sessions are not thread-safe."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=self.workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+            self._sessions.append(session)
+        return session
+
+    def _get(self, url, **kwargs):
+        """GET with exponential backoff on connection errors and retryable statuses."""
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait(url)
+            try:
+                response = self.session.get(url, timeout=self.timeout, **kwargs)
+            except requests.RequestException:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response
+                response.close()
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def resolve_pdf_url(self, url):
+        """Map a paper landing page to its PDF, like clicking the "PDF" link."""
+        if url.lower().endswith('.pdf'):
+            return url
+        if urlparse(url).netloc.endswith('aclanthology.org'):
+            return url.rstrip('/') + '.pdf'
+        page = self._get(url)
+        match = PDF_LINK_PATTERN.search(page.text)
+        if not match:
+            raise ValueError(f"No PDF link found on {url}")
+        return urljoin(url, match.group(1))
+
+    def _store(self, response):
+        """Stream a response to a temp file, then move it to its content address."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.download_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for block in response.iter_content(chunk_size=1 << 16):
+                    digest.update(block)
+                    size += len(block)
+                    f.write(block)
+            sha256 = digest.hexdigest()
+            relative_path = os.path.join(sha256[:2], f"{sha256}.pdf")
+            final_path = os.path.join(self.download_dir, relative_path)
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(temp_path, final_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return sha256, relative_path, size
+
+    def download(self, url):
+        """Download one paper and record the outcome in the manifest."""
+        start = time.perf_counter()
+        record = {'url': url}
+        try:
+            pdf_url = self.resolve_pdf_url(url)
+            with self._get(pdf_url, stream=True) as response:
+                sha256, relative_path, size = self._store(response)
+            record.update(status='ok', pdf_url=pdf_url, sha256=sha256, path=relative_path, bytes=size)
+        except (requests.RequestException, ValueError, OSError) as e:
+            record.update(status='failed', error=str(e))
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        self.manifest.add(record)
+        return record
+
+    def download_all(self, urls):
+        """
+        Download every URL not already completed, returning the manifest
+        record of each URL in input order.
+        """
+        urls = list(dict.fromkeys(urls))
+        pending = [url for url in urls if not self.manifest.completed(url, self.download_dir)]
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(self.download, pending))
+        finally:
+            while self._sessions:
+                self._sessions.pop().close()
+            self._local = threading.local()
+        return [self.manifest.records[url] for url in urls]
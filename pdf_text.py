@@ -0,0 +1,96 @@
+import io
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import partial
+
+import fitz  # PyMuPDF
+
+from corpus_cache import file_sha256
+from parallel import ordered_map
+
+def iter_pdf_pages(pdf_path):
+    """Yield the text of each page without holding the whole document's text."""
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            yield page.get_text()
+
+def write_pdf_pages(pdf_path, out):
+    """Write the text of each page to `out` as it is extracted; return the page count."""
+    pages = 0
+    for pages, page_text in enumerate(iter_pdf_pages(pdf_path), start=1):
+        out.write(page_text)
+    return pages
+
+class TextCache:
+    """Extracted PDF text stored as `<cache_dir>/<sha256 of the PDF>.txt`."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, sha256):
+        return os.path.join(self.cache_dir, f"{sha256}.txt")
+
+    def get(self, sha256):
+        try:
+            with open(self._path(sha256), 'r', encoding='utf-8', newline='') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def writer(self, sha256):
+        """
+        Yield a file to write the text into piece by piece. It is written to
+        a temp file first so concurrent workers never see partial text, and
+        only replaces the cache entry once the block completes.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                yield f
+            os.replace(temp_path, self._path(sha256))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+def extract_text(pdf_path, cache_dir=None):
+    """
+    Return (text, info) for one PDF. `info` carries the timing, page count,
+    cache hit and any error, so callers can report them in one summary.
+    """
+    start = time.perf_counter()
+    info = {'file': pdf_path, 'sha256': '', 'pages': None, 'cached': False, 'error': ''}
+    text = ''
+    try:
+        cache = TextCache(cache_dir) if cache_dir else None
+        if cache:
+            info['sha256'] = file_sha256(pdf_path)
+            text = cache.get(info['sha256'])
+            info['cached'] = text is not None
+        if not info['cached'] and cache:
+            # Pages go straight to the cache file; the text is read back once complete
+            with cache.writer(info['sha256']) as f:
+                info['pages'] = write_pdf_pages(pdf_path, f)
+            text = cache.get(info['sha256'])
+        elif not info['cached']:
+            buffer = io.StringIO()
+            info['pages'] = write_pdf_pages(pdf_path, buffer)
+            text = buffer.getvalue()
+    except Exception as e:
+        info['error'] = f"{type(e).__name__}: {e}"
+        text = ''
+    info['seconds'] = round(time.perf_counter() - start, 4)
+    return text, info
+
+def _extract_chunk(pdf_paths, cache_dir):
+    return [extract_text(pdf_path, cache_dir) for pdf_path in pdf_paths]
+
+def extract_texts(pdf_paths, cache_dir=None, workers=1):
+    """Yield (text, info) per PDF in input order, extracting in a process pool."""
+    results = ordered_map(partial(_extract_chunk, cache_dir=cache_dir), pdf_paths,
+                          workers=workers, chunk_size=1)
+    for chunk in results:
+        yield from chunk
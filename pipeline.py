@@ -0,0 +1,348 @@
+"""
+Run the whole screening workflow as a dependency graph of cached stages.
+
+    python pipeline.py --config pipeline.json            # everything that is stale
+    python pipeline.py write_stats --jobs 2               # one target and what it needs
+    python pipeline.py --status                           # show which stages would run
+
+Every stage stores its result under `work_dir` together with a fingerprint
+of its configuration, its input files and the fingerprints of the stages it
+depends on. A stage reruns only when that fingerprint changes or one of its
+output files is missing; stages whose dependencies are done run
+concurrently in separate processes.
+"""
+import argparse
+import inspect
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from aggregation import load_script
+from incremental import fingerprint
+from pdf_text import TextCache, extract_text as extract_pdf_text
+from text_index import DEFAULT_TEXT_INDEX_PATH, TextIndex
+
+DEFAULT_CONFIG = {
+    'database_dir': 'boolean-search/all-zot-items',
+    'acl_bib': 'boolean-search/all-zot-items/anthology+abstracts.bib',
+    'output_dir': 'statistics',
+    'download_dir': 'acl-model-papers',
+    'work_dir': '.pipeline',
+    'workers': 1,
+    'chunk_size': 500,
+    'download_workers': 8,
+    'sort_by': 'f1_score',
+}
+
+def filtering():
+    return load_script('filtering', 'filtering.py')
+
+def acl_filtering():
+    return load_script('acl_filtering', 'acl-filtering.py')
+
+def acl_model_filtering():
+    return load_script('acl_model_filtering', 'acl-model-filtering.py')
+
+def output_path(config, filename):
+    return os.path.join(config['output_dir'], filename)
+
+def file_signature(path):
+    """(path, size, mtime) of a file, or of every file below a directory."""
+    if os.path.isdir(path):
+        return sorted(file_signature(os.path.join(path, name)) for name in os.listdir(path))
+    if not os.path.exists(path):
+        return [path, None]
+    stat = os.stat(path)
+    return [path, stat.st_size, stat.st_mtime_ns]
+
+# --- Stages ---
+# Each stage function takes (config, inputs) where inputs maps dependency
+# names to their results, writes its output files and returns its result.
+
+def ingest(config, inputs):
+    return list(filtering().parse_exports(config['database_dir'], workers=config['workers']))
+
+def dedup(config, inputs):
+    module = filtering()
+    index = module.DuplicateIndex()
+    all_papers, duplicates, total = module.deduplicate_papers(inputs['ingest'], dedup=index)
+    print(f"{total} papers, {duplicates} duplicates removed")
+    return {'papers': all_papers, 'duplicates': index.duplicates, 'totals': {
+        'total_papers': total, 'original_papers': len(all_papers), 'duplicates': duplicates,
+        'exact_duplicates': index.exact_count, 'fuzzy_duplicates': index.fuzzy_count}}
+
+def classify(config, inputs):
+    module = filtering()
+    matcher = module.compile_patterns()
+    papers_info = []
+    shards = module.ordered_map(module.partial(module.analyze_chunk, matcher=matcher),
+                                module.release(inputs['dedup']['papers']),
+                                workers=config['workers'], chunk_size=config['chunk_size'])
+    for shard in shards:
+        papers_info.extend(paper_info for paper_info in shard if paper_info)
+    return papers_info
+
+def write_stats(config, inputs):
+    module = filtering()
+    database_stats = module.new_database_stats()
+    global_stats = {category: {'papers': 0, 'machine_learning': 0, 'dataset': 0}
+                    for category in ['emotion', 'empathy', 'emotion_and_empathy']}
+    global_stats.update(inputs['dedup']['totals'])
+    papers_info = inputs['classify']
+    for paper_info in papers_info:
+        module.count_paper(database_stats, global_stats, paper_info)
+    os.makedirs(config['output_dir'], exist_ok=True)
+    module.save_paper_info_to_csv(papers_info, output_path(config, 'final_automatically_screened_papers.csv'))
+    module.save_duplicates_to_csv(inputs['dedup']['duplicates'], output_path(config, 'final_duplicate_papers.csv'))
+    module.print_and_save_stats(dict(database_stats), global_stats,
+                                output_path(config, 'final_analysis_statistics.txt'))
+
+def acl_classify(config, inputs):
+    module = acl_filtering()
+    papers_info, stats = module.analyze_papers(module.iter_bibtex_entries(config['acl_bib']), module.compile_patterns(),
+                                               workers=config['workers'], chunk_size=config['chunk_size'])
+    return {'papers': papers_info, 'stats': stats}
+
+def acl_write_stats(config, inputs):
+    module = acl_filtering()
+    os.makedirs(config['output_dir'], exist_ok=True)
+    module.save_results_to_csv(inputs['acl_classify']['papers'],
+                               output_path(config, 'final_automatically_screened_acl_papers.csv'))
+    module.print_statistics(inputs['acl_classify']['stats'], output_path(config, 'final_analysis_statistics_acl.txt'))
+
+def download_pdfs(config, inputs):
+    return acl_model_filtering().download_pdfs(output_path(config, 'final_automatically_screened_acl_papers.csv'),
+                                               config['download_dir'], workers=config['download_workers'])
+
+def extract_text(config, inputs):
+    from pdf_text import extract_texts
+    downloaded = [record for record in inputs['download_pdfs'] if record['status'] == 'ok']
+    pdf_paths = [os.path.join(config['download_dir'], record['path']) for record in downloaded]
+    infos = [info for _, info in extract_texts(pdf_paths, text_cache_dir(config), workers=config['workers'])]
+    if infos:
+        acl_model_filtering().print_extraction_summary(
+            infos, os.path.join(config['download_dir'], 'extraction_summary.csv'))
+    return list(zip(downloaded, infos))
+
+def extract_metrics(config, inputs):
+    module = acl_model_filtering()
+    cache = TextCache(text_cache_dir(config))
+    data = []
+    # Papers already in the text index need neither their text nor a regex pass
+    with TextIndex(os.path.join(config['download_dir'], DEFAULT_TEXT_INDEX_PATH)) as index:
+        for record, info in inputs['extract_text']:
+            text = None
+            if info['sha256'] not in index:
+                text = cache.get(info['sha256']) if info['sha256'] else None
+                if text is None:  # Failed earlier or the cache was cleared since
+                    text, info = extract_pdf_text(info['file'], text_cache_dir(config))
+            doc_id = index.add(record, None if info['error'] else info['sha256'], text)
+            data.append(module.summarize_hits(record, index.hits(doc_id)))
+    os.makedirs(config['output_dir'], exist_ok=True)
+    module.save_model_performance(data, output_path(config, 'model_performance.csv'), config['sort_by'])
+
+def text_cache_dir(config):
+    return os.path.join(config['download_dir'], 'text-cache')
+
+def source_signature(filenames):
+    """Content hash of each module file (relative to this directory) a stage runs."""
+    signature = []
+    for filename in filenames:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), filename), 'r', encoding='utf-8') as f:
+            signature.append([filename, fingerprint(f.read())])
+    return signature
+
+class Stage:
+    """
+    One step of the pipeline: `config_keys` and `input_files` (config keys
+    naming files or directories) feed its fingerprint, `outputs` are the
+    files it must leave behind. `sources` are the modules the stage's code
+    runs; their contents and the stage function's own source feed the
+    fingerprint too, so editing the parsing, rules or formatting a stage
+    applies makes it stale.
+    """
+
+    def __init__(self, name, func, deps=(), config_keys=(), input_files=(), outputs=(), sources=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.config_keys = tuple(config_keys)
+        self.input_files = tuple(input_files)
+        self.outputs = tuple(outputs)
+        self.sources = tuple(sources)
+
+    def output_paths(self, config):
+        return [output_path(config, filename) for filename in self.outputs]
+
+# Modules behind the filtering.py and acl-filtering.py stages
+FILTERING_SOURCES = ['filtering.py', 'records.py']
+ACL_FILTERING_SOURCES = ['acl-filtering.py', 'acl_screening.py', 'matcher.py', 'records.py']
+
+STAGES = [
+    Stage('ingest', ingest, input_files=['database_dir'], sources=FILTERING_SOURCES),
+    Stage('dedup', dedup, deps=['ingest'], sources=FILTERING_SOURCES + ['dedup.py']),
+    Stage('classify', classify, deps=['dedup'], sources=FILTERING_SOURCES + ['matcher.py']),
+    Stage('write_stats', write_stats, deps=['dedup', 'classify'], config_keys=['output_dir'],
+          outputs=['final_automatically_screened_papers.csv', 'final_duplicate_papers.csv',
+                   'final_analysis_statistics.txt'], sources=FILTERING_SOURCES),
+    Stage('acl_classify', acl_classify, input_files=['acl_bib'], sources=ACL_FILTERING_SOURCES),
+    Stage('acl_write_stats', acl_write_stats, deps=['acl_classify'], config_keys=['output_dir'],
+          outputs=['final_automatically_screened_acl_papers.csv', 'final_analysis_statistics_acl.txt'],
+          sources=ACL_FILTERING_SOURCES),
+    # The downloader keeps its own manifest, so a rerun only fetches what is missing
+    Stage('download_pdfs', download_pdfs, deps=['acl_write_stats'], config_keys=['download_dir'],
+          sources=['acl-model-filtering.py', 'pdf_downloader.py']),
+    Stage('extract_text', extract_text, deps=['download_pdfs'], config_keys=['download_dir'],
+          sources=['acl-model-filtering.py', 'pdf_text.py']),
+    Stage('extract_metrics', extract_metrics, deps=['extract_text'], config_keys=['output_dir', 'sort_by'],
+          outputs=['model_performance.csv'],
+          sources=['acl-model-filtering.py', 'model_extraction.py', 'text_index.py', 'pdf_text.py']),
+]
+
+class Pipeline:
+    """Schedule stages in dependency order, skipping those whose stored fingerprint still matches."""
+
+    def __init__(self, config, stages=STAGES):
+        self.config = config
+        self.stages = {stage.name: stage for stage in stages}
+        self.fingerprints = {}
+        os.makedirs(config['work_dir'], exist_ok=True)
+
+    def _paths(self, name):
+        base = os.path.join(self.config['work_dir'], name)
+        return f"{base}.pkl", f"{base}.json"
+
+    def required(self, targets):
+        """The targets and everything they depend on, in dependency order."""
+        order = []
+        def visit(name):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage {name!r}; stages are {', '.join(self.stages)}")
+            if name in order:
+                return
+            for dep in self.stages[name].deps:
+                visit(dep)
+            order.append(name)
+        for target in targets:
+            visit(target)
+        return order
+
+    def fingerprint(self, name):
+        """Needs the fingerprints of the stage's dependencies to be known already."""
+        stage = self.stages[name]
+        return fingerprint(name, [self.config[key] for key in stage.config_keys],
+                           [file_signature(self.config[key]) for key in stage.input_files],
+                           [self.fingerprints[dep] for dep in stage.deps],
+                           inspect.getsource(stage.func), source_signature(stage.sources))
+
+    def is_fresh(self, name):
+        stage = self.stages[name]
+        result_path, meta_path = self._paths(name)
+        if not os.path.exists(result_path) or not os.path.exists(meta_path):
+            return False
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return (meta['fingerprint'] == self.fingerprints[name]
+                and all(os.path.exists(path) for path in stage.output_paths(self.config)))
+
+    def status(self, targets):
+        """(name, fresh) per required stage; a stale stage makes everything downstream stale."""
+        stale = set()
+        rows = []
+        for name in self.required(targets):
+            self.fingerprints[name] = self.fingerprint(name)
+            fresh = not stale.intersection(self.stages[name].deps) and self.is_fresh(name)
+            if not fresh:
+                stale.add(name)
+            rows.append((name, fresh))
+        return rows
+
+    def load_result(self, name):
+        with open(self._paths(name)[0], 'rb') as f:
+            return pickle.load(f)
+
+    def run(self, targets, jobs=1, force=()):
+        """Run every stale stage needed for `targets`, `jobs` stages at a time."""
+        pending = self.required(targets)
+        done = set()
+        stale = set(force)
+        running = {}
+        executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        try:
+            while pending or running:
+                for name in [name for name in pending if done.issuperset(self.stages[name].deps)]:
+                    pending.remove(name)
+                    self.fingerprints[name] = self.fingerprint(name)
+                    if name not in stale and not stale.intersection(self.stages[name].deps) and self.is_fresh(name):
+                        print(f"[pipeline] {name}: up to date")
+                        done.add(name)
+                        continue
+                    stale.add(name)
+                    print(f"[pipeline] {name}: running")
+                    args = (self.stages[name], self.config, self._paths(name), self.fingerprints[name])
+                    if executor is None:
+                        _run_stage(*args)
+                        print(f"[pipeline] {name}: done")
+                        done.add(name)
+                    else:
+                        running[executor.submit(_run_stage, *args)] = name
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    future.result()  # Re-raise a failed stage's exception
+                    print(f"[pipeline] {name}: done")
+                    done.add(name)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+def _run_stage(stage, config, paths, stage_fingerprint):
+    """Run one stage (possibly in a worker process) and persist its result."""
+    inputs = {}
+    for dep in stage.deps:
+        with open(os.path.join(config['work_dir'], f"{dep}.pkl"), 'rb') as f:
+            inputs[dep] = pickle.load(f)
+    start = time.perf_counter()
+    result = stage.func(config, inputs)
+    result_path, meta_path = paths
+    # Write the result before the fingerprint, so an interrupted stage reruns
+    with open(f"{result_path}.part", 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{result_path}.part", result_path)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'fingerprint': stage_fingerprint, 'seconds': round(time.perf_counter() - start, 3)}, f)
+
+def load_config(path=None, overrides=None):
+    config = dict(DEFAULT_CONFIG)
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    config.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return config
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the screening workflow, rerunning only stale stages.')
+    parser.add_argument('targets', nargs='*', help='Stages to bring up to date (default: all)')
+    parser.add_argument('--config', help='JSON file overriding DEFAULT_CONFIG')
+    parser.add_argument('--jobs', type=int, default=2, help='Stages to run at the same time')
+    parser.add_argument('--workers', type=int, help='Processes used inside classification and text extraction')
+    parser.add_argument('--force', action='append', default=[], metavar='STAGE',
+                        help='Rerun a stage (and everything after it) even if it is up to date')
+    parser.add_argument('--status', action='store_true', help='Only show which stages are up to date')
+    args = parser.parse_args()
+
+    config = load_config(args.config, {'workers': args.workers})
+    pipeline = Pipeline(config)
+    targets = args.targets or [stage.name for stage in STAGES]
+    if args.status:
+        for name, fresh in pipeline.status(targets):
+            print(f"{name:16s} {'up to date' if fresh else 'stale'}")
+        return
+    pipeline.run(targets, jobs=args.jobs, force=args.force)
+
+if __name__ == "__main__":
+    main()
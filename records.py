@@ -0,0 +1,103 @@
+import sys
+
+class Record:
+    """
+    Slotted record of one screened paper: no per-instance dict, list fields
+    stored as tuples, and the names repeated across thousands of papers
+    (database, category) interned so every record shares one copy.
+
+    Fields read like dict keys (record['title'], record.get('doi'), dict(record))
+    so code written against the old paper dicts keeps working. Records are
+    immutable once built; pickling sends only the field values.
+    """
+    __slots__ = ()
+    INTERNED = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            value = fields.pop(name)
+            if name in self.INTERNED:
+                value = sys.intern(value)
+            elif isinstance(value, list):
+                value = tuple(value)
+            object.__setattr__(self, name, value)
+        if fields:
+            raise TypeError(f"Unknown {type(self).__name__} fields: {', '.join(fields)}")
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(**dict(zip(cls.__slots__, values)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return self.from_values, (self.values(),)
+
+    # Only field names are keys; methods such as keys or items are not
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name, default=None):
+        return getattr(self, name) if name in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def items(self):
+        return zip(self.__slots__, self.values())
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.values() == other.values()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={value!r}' for name, value in self.items())})"
+
+class PaperRecord(Record):
+    """A relevant paper from the database exports (filtering.py), fields in CSV column order."""
+    __slots__ = ('database', 'title', 'authors', 'year', 'journal', 'volume', 'issue', 'doi', 'abstract',
+                 'keywords', 'url', 'type', 'category', 'is_dataset', 'is_ml')
+    INTERNED = ('database', 'category')
+
+class AclPaperRecord(Record):
+    """A relevant paper from the ACL anthology (acl-filtering.py), fields in CSV column order."""
+    __slots__ = ('title', 'authors', 'year', 'booktitle', 'doi', 'abstract', 'url', 'category',
+                 'is_dataset', 'is_ml', 'is_ai')
+    INTERNED = ('category',)
+
+def as_record(record_type, paper_info):
+    """Turn a paper dict (e.g. a result stored by ScreeningState) into a record."""
+    return paper_info if isinstance(paper_info, record_type) else record_type(**paper_info)
+
+def csv_row(paper, fieldnames):
+    """Values for one CSV row: flags as Yes/No, lists joined with '; '."""
+    row = []
+    for name in fieldnames:
+        value = paper[name]
+        if isinstance(value, bool):
+            value = 'Yes' if value else 'No'
+        elif isinstance(value, (list, tuple)):
+            value = '; '.join(value)
+        row.append(value)
+    return row
+
+def release(items):
+    """Yield the items of a list, dropping the list's reference to each one as it is handed out."""
+    for index, item in enumerate(items):
+        items[index] = None
+        yield item
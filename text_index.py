@@ -0,0 +1,246 @@
+"""
+Full-text index of the PDF text acl-model-filtering.py extracts, with the
+model and metric hits found in each section.
+
+    python text_index.py acl-model-papers/text_index.sqlite search '"pearson correlation" AND empath*'
+    python text_index.py acl-model-papers/text_index.sqlite search 'heading: results AND NEAR(pearson empathy, 10)'
+    python text_index.py acl-model-papers/text_index.sqlite papers --model RoBERTa --metric f1_score --min 0.7
+    python text_index.py acl-model-papers/text_index.sqlite model-performance statistics/model_performance.csv
+"""
+import argparse
+import sqlite3
+
+from incremental import fingerprint
+from model_extraction import ModelMetricExtractor, split_sections
+
+DEFAULT_TEXT_INDEX_PATH = 'text_index.sqlite'
+
+class TextIndex:
+    """
+    Extracted text and ModelMetricExtractor hits of every downloaded paper,
+    in one SQLite file.
+
+    Text is stored once per PDF (keyed by its SHA-256), split into the
+    sections the extractor sees, with an FTS5 index over them. search()
+    takes FTS5 queries: phrases in double quotes, AND / OR / NOT, NEAR()
+    and prefix* terms, and `heading:` to restrict a term to section
+    headings. Hits are kept in extraction order, so model_performance.csv
+    can be rebuilt from them exactly as summarize_document builds it from
+    the text.
+
+    add() skips PDFs that are already indexed, so the index can be fed as
+    PDFs arrive. Each document records which extractor patterns produced
+    its hits; after the patterns change, refresh() recomputes the hits from
+    the stored text instead of reopening the PDFs.
+    """
+
+    def __init__(self, path=DEFAULT_TEXT_INDEX_PATH, extractor=None):
+        self.path = path
+        self.extractor = extractor or ModelMetricExtractor()
+        self.version = fingerprint(self.extractor.pattern.pattern)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id INTEGER PRIMARY KEY,
+                sha256 TEXT NOT NULL UNIQUE,
+                extractor TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS papers (
+                url TEXT PRIMARY KEY,
+                file TEXT NOT NULL,
+                doc_id INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS papers_doc ON papers (doc_id);
+            CREATE TABLE IF NOT EXISTS sections (
+                section_id INTEGER PRIMARY KEY,
+                doc_id INTEGER NOT NULL,
+                heading TEXT NOT NULL,
+                body TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sections_doc ON sections (doc_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS section_text USING fts5(
+                heading, body, content='sections', content_rowid='section_id',
+                tokenize='unicode61 remove_diacritics 2', prefix='3');
+            CREATE TABLE IF NOT EXISTS hits (
+                doc_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                section TEXT NOT NULL,
+                model TEXT COLLATE NOCASE,
+                metric TEXT,
+                value REAL,
+                PRIMARY KEY (doc_id, position)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS hits_model ON hits (model, doc_id);
+            CREATE INDEX IF NOT EXISTS hits_metric ON hits (metric, value, doc_id);
+        ''')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM papers').fetchone()[0]
+
+    def __contains__(self, sha256):
+        return self.conn.execute('SELECT 1 FROM documents WHERE sha256 = ?', (sha256,)).fetchone() is not None
+
+    def _store_hits(self, doc_id, text):
+        self.conn.execute('DELETE FROM hits WHERE doc_id = ?', (doc_id,))
+        self.conn.executemany(
+            'INSERT INTO hits VALUES (?, ?, ?, ?, ?, ?)',
+            ((doc_id, position, hit['section'], hit.get('model'), hit.get('metric'), hit.get('value'))
+             for position, hit in enumerate(self.extractor.iter_hits(text))))
+        self.conn.execute('UPDATE documents SET extractor = ? WHERE doc_id = ?', (self.version, doc_id))
+
+    def add(self, record, sha256, text):
+        """
+        Index one downloaded paper: `record` is its downloader manifest
+        record (url, path), `sha256` and `text` what extract_text returned.
+        The text is only split and indexed the first time its PDF is seen,
+        so it may be None for a PDF already in the index. Papers whose text
+        could not be extracted are added with a `sha256` of None and keep
+        their empty row in model_performance.csv. Returns the document's ID
+        for hits().
+        """
+        with self.conn:
+            if sha256 is None:
+                row = (None, self.version)
+            else:
+                row = self.conn.execute('SELECT doc_id, extractor FROM documents WHERE sha256 = ?',
+                                        (sha256,)).fetchone()
+            if row is None:
+                doc_id = self.conn.execute('INSERT INTO documents (sha256, extractor) VALUES (?, ?)',
+                                           (sha256, '')).lastrowid
+                self.conn.executemany('INSERT INTO sections (doc_id, heading, body) VALUES (?, ?, ?)',
+                                      ((doc_id, heading, body) for heading, body in split_sections(text)))
+                self.conn.execute('INSERT INTO section_text (rowid, heading, body) '
+                                  'SELECT section_id, heading, body FROM sections WHERE doc_id = ?', (doc_id,))
+                self._store_hits(doc_id, text)
+            else:
+                doc_id, version = row
+                if version != self.version:
+                    self._store_hits(doc_id, self.text(doc_id) if text is None else text)
+            self.conn.execute('INSERT INTO papers (url, file, doc_id) VALUES (?, ?, ?) '
+                              'ON CONFLICT (url) DO UPDATE SET file = excluded.file, doc_id = excluded.doc_id',
+                              (record['url'], record['path'], doc_id))
+        return doc_id
+
+    def text(self, doc_id):
+        return ''.join(body for (body,) in self.conn.execute(
+            'SELECT body FROM sections WHERE doc_id = ? ORDER BY section_id', (doc_id,)))
+
+    def refresh(self):
+        """Recompute hits indexed with other extractor patterns; return how many documents changed."""
+        stale = [doc_id for (doc_id,) in self.conn.execute(
+            'SELECT doc_id FROM documents WHERE extractor != ?', (self.version,))]
+        for doc_id in stale:
+            with self.conn:
+                self._store_hits(doc_id, self.text(doc_id))
+        return len(stale)
+
+    def hits(self, doc_id):
+        """The document's hits in extraction order, shaped as ModelMetricExtractor.iter_hits yields them."""
+        for section, model, metric, value in self.conn.execute(
+                'SELECT section, model, metric, value FROM hits WHERE doc_id = ? ORDER BY position', (doc_id,)):
+            yield {'section': section, 'model': model} if model is not None else \
+                {'section': section, 'metric': metric, 'value': value}
+
+    def iter_papers(self):
+        """Yield (record, hits) per paper in the order they were first indexed."""
+        self.refresh()
+        for url, file, doc_id in self.conn.execute('SELECT url, file, doc_id FROM papers ORDER BY rowid').fetchall():
+            yield {'url': url, 'path': file}, self.hits(doc_id)
+
+    def search(self, query, limit=20):
+        """
+        Best-matching sections for an FTS5 query, as dicts with the paper's
+        url and file, the section heading and a snippet around the match.
+        """
+        try:
+            rows = self.conn.execute('''
+                SELECT p.url, p.file, s.heading, snippet(section_text, 1, '[', ']', ' ... ', 12)
+                FROM section_text
+                JOIN sections s ON s.section_id = section_text.rowid
+                JOIN papers p ON p.doc_id = s.doc_id
+                WHERE section_text MATCH ? ORDER BY rank LIMIT ?''', (query, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}") from None
+        return [{'url': url, 'file': file, 'section': heading, 'snippet': snippet}
+                for url, file, heading, snippet in rows]
+
+    def papers(self, query=None, model=None, metric=None, min_value=None, max_value=None):
+        """
+        Papers (url and file) meeting every given condition: text matching
+        an FTS5 query, a mention of `model` (canonical name, any case) and a
+        `metric` reported anywhere with a value in [min_value, max_value].
+        """
+        conditions, params = [], []
+        if query:
+            conditions.append('doc_id IN (SELECT doc_id FROM sections WHERE section_id IN '
+                              '(SELECT rowid FROM section_text WHERE section_text MATCH ?))')
+            params.append(query)
+        if model:
+            conditions.append('doc_id IN (SELECT doc_id FROM hits WHERE model = ?)')
+            params.append(model)
+        if metric:
+            condition = 'metric = ?'
+            params.append(metric.lower().replace(' ', '_'))
+            if min_value is not None:
+                condition += ' AND value >= ?'
+                params.append(min_value)
+            if max_value is not None:
+                condition += ' AND value <= ?'
+                params.append(max_value)
+            conditions.append(f"doc_id IN (SELECT doc_id FROM hits WHERE {condition})")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        try:
+            rows = self.conn.execute(f"SELECT url, file FROM papers {where} ORDER BY rowid", params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}") from None
+        return [{'url': url, 'file': file} for url, file in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the full-text index written by acl-model-filtering.py.')
+    parser.add_argument('index', help='Index file, e.g. acl-model-papers/text_index.sqlite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    search = commands.add_parser('search', help='Best-matching sections for an FTS5 query')
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=20)
+    papers = commands.add_parser('papers', help='Papers matching text, model and metric conditions')
+    papers.add_argument('--query', help='FTS5 query the text must match')
+    papers.add_argument('--model', help='Model the paper mentions, e.g. RoBERTa')
+    papers.add_argument('--metric', help='Metric the paper reports, e.g. f1_score')
+    papers.add_argument('--min', type=float, dest='min_value', help='Lowest accepted metric value')
+    papers.add_argument('--max', type=float, dest='max_value', help='Highest accepted metric value')
+    performance = commands.add_parser('model-performance', help='Rebuild model_performance.csv from the index')
+    performance.add_argument('output_csv')
+    performance.add_argument('--sort-by', default='f1_score')
+    args = parser.parse_args()
+
+    with TextIndex(args.index) as index:
+        try:
+            if args.command == 'search':
+                for result in index.search(args.query, args.limit):
+                    print(f"{result['file']} [{result['section']}]\n    {' '.join(result['snippet'].split())}")
+            elif args.command == 'papers':
+                if args.metric is None and (args.min_value is not None or args.max_value is not None):
+                    parser.error('--min and --max need --metric')
+                results = index.papers(args.query, args.model, args.metric, args.min_value, args.max_value)
+                for result in results:
+                    print(f"{result['file']}\t{result['url']}")
+                print(f"{len(results)} papers")
+            else:
+                from aggregation import load_script
+                acl_model_filtering = load_script('acl_model_filtering', 'acl-model-filtering.py')
+                acl_model_filtering.save_model_performance(
+                    acl_model_filtering.summarize_index(index), args.output_csv, args.sort_by)
+        except ValueError as e:
+            parser.error(str(e))
+
+if __name__ == "__main__":
+    main()